@@ -0,0 +1,81 @@
+"""
+JSON vs MessagePack for the websocket protocol.
+
+Measures decode+validate throughput for inbound commands and encode throughput
+and size for outbound game updates (6-max table, mid-hand state).
+
+Run from backend/:  python benchmarks/bench_protocol.py
+"""
+import sys
+import os
+import json
+import time
+
+sys.path.append(os.getcwd())
+
+from poker_engine.game import Game
+from poker_engine.protocol import JSON_CODEC, MSGPACK_CODEC, decode_command, msgpack
+
+# Typical traffic mix seen at a table: mostly actions, some chat
+COMMANDS = [
+    {"action": "call", "amount": 0},
+    {"action": "raise", "amount": 120},
+    {"action": "fold", "amount": 0},
+    {"action": "check", "amount": 0},
+    {"action": "chat", "message": "nice hand, well played"},
+]
+
+def six_max_update():
+    g = Game("bench")
+    for i in range(6):
+        g.add_player(f"player_{i}", 1000)
+    g.start_round()
+    # Same shape RoomActor._process broadcasts for a batch, with the seq the event log adds
+    actions = []
+    for _ in range(6):
+        username = g.players[g.turn_index].username
+        g.player_action(username, "call")
+        actions.append({"username": username, "action": "call", "amount": 0})
+    return {"type": "game_update", "state": g.get_state(), "actions": actions, "seq": 42}
+
+def rate(fn, items, seconds=0.5):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for item in items:
+            fn(item)
+        count += len(items)
+    return count / (time.perf_counter() - start)
+
+def main():
+    json_frames = [json.dumps(c) for c in COMMANDS]
+    rows = [
+        ("commands  json.loads (old, unvalidated)", rate(json.loads, json_frames),
+         sum(map(len, json_frames)) / len(json_frames)),
+        ("commands  json + schema", rate(decode_command, json_frames),
+         sum(map(len, json_frames)) / len(json_frames)),
+    ]
+    if msgpack is not None:
+        packed = [msgpack.packb(c) for c in COMMANDS]
+        rows.append(("commands  msgpack + schema", rate(lambda f: decode_command(f, binary=True), packed),
+                     sum(map(len, packed)) / len(packed)))
+
+    update = six_max_update()
+    rows.append(("game_update encode json", rate(JSON_CODEC.encode, [update]), len(JSON_CODEC.encode(update))))
+    if msgpack is not None:
+        rows.append(("game_update encode msgpack", rate(MSGPACK_CODEC.encode, [update]), len(MSGPACK_CODEC.encode(update))))
+
+    print(f"{'case':<42}{'msgs/sec':>12}{'bytes/msg':>12}")
+    for name, per_sec, size in rows:
+        print(f"{name:<42}{per_sec:>12,.0f}{size:>12.0f}")
+
+    # A busy 6-max table: ~1 action/sec, each fanned out to 6 sockets
+    actions_per_sec = 1
+    for name, per_sec, size in rows:
+        if name.startswith("game_update"):
+            print(f"{name}: {6 * actions_per_sec * size / 1024:.1f} KiB/s per table outbound")
+
+if __name__ == "__main__":
+    if msgpack is None:
+        print("msgpack not installed: binary rows skipped")
+    main()
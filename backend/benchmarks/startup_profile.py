@@ -0,0 +1,80 @@
+"""
+Cold start profile for the API worker.
+
+Runs in fresh interpreters so nothing is cached:
+  1. `python -X importtime -c "import main"` -> slowest imports
+  2. wall time for `import main` and for the lifespan startup (DB init + evaluator tables)
+
+Exits non-zero if the total goes over the budget, so it can run in CI.
+
+Run from backend/:  python benchmarks/startup_profile.py [--budget-ms 1500] [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "1500"))
+
+TIMING_SNIPPET = """
+import asyncio, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+async def start():
+    ctx = main.lifespan(main.app)
+    await ctx.__aenter__()
+    t2 = time.perf_counter()
+    await ctx.__aexit__(None, None, None)
+    return t2
+t2 = asyncio.run(start())
+print(f"{(t1 - t0) * 1000:.1f} {(t2 - t1) * 1000:.1f}")
+"""
+
+def run(args, env):
+    return subprocess.run([sys.executable] + args, cwd=os.getcwd(), env=env,
+                          capture_output=True, text=True, check=True)
+
+def import_profile(env, top):
+    stderr = run(["-X", "importtime", "-c", "import main"], env).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # importtime indents two spaces per nesting level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    # What main pulls in directly, by total cost including everything beneath it
+    direct = sorted((r for r in rows if r[3] == 1), key=lambda r: r[2], reverse=True)
+    print(f"{'import (direct from main)':<40}{'cumulative ms':>15}")
+    for name, _, cumulative, _ in direct[:top]:
+        print(f"{name:<40}{cumulative / 1000:>15.1f}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        # Throwaway database so profiling never touches the real one
+        env["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'startup.db')}"
+        env["PYTHONDONTWRITEBYTECODE"] = "1"
+
+        import_profile(env, args.top)
+        import_ms, lifespan_ms = map(float, run(["-c", TIMING_SNIPPET], env).stdout.split()[-2:])
+
+    total = import_ms + lifespan_ms
+    print()
+    print(f"import main      {import_ms:8.1f} ms")
+    print(f"lifespan startup {lifespan_ms:8.1f} ms")
+    print(f"total            {total:8.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if total > args.budget_ms:
+        print("Over budget")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional, Tuple
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+import base64
+import json
+import models, schemas
+
+EXPORT_CHUNK_SIZE = 1000
+
+def encode_cursor(transaction: models.Transaction) -> str:
+    raw = f"{transaction.timestamp.isoformat()}|{transaction.id}"
+    # Unpadded so it can go in a query string as-is
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Raises ValueError for anything that isn't a cursor we handed out."""
+    try:
+        timestamp, transaction_id = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(transaction_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor") from None
+
+def transactions_page(db: Session, user_id: int, limit: int, cursor: Optional[str] = None) -> Tuple[List[models.Transaction], Optional[str]]:
+    """
+    Newest first, keyset paginated on (timestamp, id).
+    Each page is an index range scan on ix_transactions_user_ts_id, so page N
+    costs the same as page 1 (no OFFSET).
+    """
+    query = db.query(models.Transaction).filter(models.Transaction.user_id == user_id)
+    if cursor is not None:
+        query = query.filter(
+            tuple_(models.Transaction.timestamp, models.Transaction.id) < decode_cursor(cursor)
+        )
+    # Fetch one extra row to know whether there is a next page
+    rows = query.order_by(
+        models.Transaction.timestamp.desc(), models.Transaction.id.desc()
+    ).limit(limit + 1).all()
+
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+def export_ndjson(session_factory: Callable[[], Session], user_id: int, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Full history as one JSON object per line.
+    Uses its own session (the request's is closed before a streaming body runs)
+    and walks the history page by page, so memory stays at one chunk.
+    """
+    db = session_factory()
+    try:
+        cursor = None
+        while True:
+            rows, cursor = transactions_page(db, user_id, chunk_size, cursor)
+            lines = [
+                json.dumps(schemas.TransactionResponse.model_validate(row).model_dump(mode="json")) + "\n"
+                for row in rows
+            ]
+            if lines:
+                yield "".join(lines)
+            if cursor is None:
+                break
+            db.expunge_all()
+    finally:
+        db.close()
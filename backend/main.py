@@ -1,17 +1,98 @@
-from fastapi import FastAPI, Depends, HTTPException, status, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Depends, HTTPException, Query, status, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-import models, schemas, database, auth
+from typing import Optional
+from datetime import datetime
+import models, schemas, database, auth, ledger
 from poker_engine.manager import manager
+from poker_engine.protocol import receive_command, ProtocolError
+from poker_engine.stats import stats, COLUMNS as STATS_COLUMNS, STATS_FLUSH_SECONDS, STATS_EXPORT_DIR
+from poker_engine.tables import get_tables
+from poker_engine.variants import VARIANTS
 from contextlib import asynccontextmanager
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+def load_player_stats():
+    db = database.SessionLocal()
+    try:
+        stats.load([
+            {"username": row.username, **{name: getattr(row, name) for name in STATS_COLUMNS}}
+            for row in db.query(models.PlayerStats)
+        ])
+    finally:
+        db.close()
+
+def write_player_stats(batch):
+    """Add a batch of counter deltas to player_stats in one transaction (blocking)."""
+    if not batch:
+        return
+    db = database.SessionLocal()
+    try:
+        existing = {
+            row.username: row for row in
+            db.query(models.PlayerStats).filter(models.PlayerStats.username.in_([u for u, _ in batch]))
+        }
+        for username, deltas in batch:
+            row = existing.get(username)
+            if row is None:
+                db.add(models.PlayerStats(username=username, updated_at=datetime.utcnow(), **deltas))
+                continue
+            for name, delta in deltas.items():
+                # Increment in SQL so several workers can flush the same player
+                setattr(row, name, getattr(models.PlayerStats, name) + delta)
+            row.updated_at = datetime.utcnow()
+        db.commit()
+    finally:
+        db.close()
+
+async def flush_player_stats():
+    # Deltas are taken on the event loop; only the DB write goes to a thread
+    batch = stats.take_dirty()
+    try:
+        await asyncio.to_thread(write_player_stats, batch)
+    except Exception:
+        logger.exception("Failed to flush player stats")
+        stats.requeue(batch)
+        return
+    if STATS_EXPORT_DIR and batch:
+        path = os.path.join(STATS_EXPORT_DIR, f"stats-{datetime.utcnow():%Y%m%dT%H%M%S}.npz")
+        await asyncio.to_thread(_write_file, path, stats.export_bytes())
+
+def _write_file(path: str, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+
+async def stats_flush_loop():
+    while True:
+        await asyncio.sleep(STATS_FLUSH_SECONDS)
+        await flush_player_stats()
+
+# Set DB_CREATE_ALL=0 where the schema is managed by migrations
+DB_CREATE_ALL = os.getenv("DB_CREATE_ALL", "1") == "1"
+
+def init_db():
+    """Blocking startup work: schema check and the stats baseline."""
+    if DB_CREATE_ALL:
+        models.Base.metadata.create_all(bind=database.engine)
+        # create_all skips tables that already exist, so add new indexes to older databases too
+        for index in models.Transaction.__table__.indexes:
+            index.create(bind=database.engine, checkfirst=True)
+    load_player_stats()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Create tables (Sync engine used in sync context? No, create_all is sync)
-    # But usually we allow sync blocking calls in startup? 
-    # Or strict updated version:
-    models.Base.metadata.create_all(bind=database.engine)
+    # Blocking startup work runs in threads, off the event loop. The evaluator tables
+    # are mmapped here (or built once under a file lock) instead of on the first showdown.
+    await asyncio.gather(asyncio.to_thread(init_db), asyncio.to_thread(get_tables))
+    flusher = asyncio.create_task(stats_flush_loop())
     yield
+    flusher.cancel()
+    await flush_player_stats()
 
 app = FastAPI(title="PokerVerse API", lifespan=lifespan)
 
@@ -85,13 +166,24 @@ def deposit_chips(amount: float, current_user: models.User = Depends(auth.get_cu
     return transaction
 
     
-@app.get("/transactions", response_model=list[schemas.TransactionResponse])
-def get_transactions(current_user: models.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
-    """Get all transactions for the current user"""
-    transactions = db.query(models.Transaction).filter(
-        models.Transaction.user_id == current_user.id
-    ).order_by(models.Transaction.timestamp.desc()).all()
-    return transactions
+@app.get("/transactions", response_model=schemas.TransactionPage)
+def get_transactions(limit: int = Query(50, ge=1, le=200), cursor: Optional[str] = None,
+                     current_user: models.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
+    """Transactions for the current user, newest first. Pass next_cursor back to get the following page."""
+    try:
+        items, next_cursor = ledger.transactions_page(db, current_user.id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+@app.get("/transactions/export")
+def export_transactions(current_user: models.User = Depends(auth.get_current_user)):
+    """Full transaction history streamed as NDJSON"""
+    return StreamingResponse(
+        ledger.export_ndjson(database.SessionLocal, current_user.id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=transactions.ndjson"},
+    )
 
 @app.get("/leaderboard")
 def get_leaderboard(db: Session = Depends(database.get_db)):
@@ -106,49 +198,104 @@ def get_leaderboard(db: Session = Depends(database.get_db)):
         "chips": player.chips
     } for i, player in enumerate(top_players)]
 
-@app.websocket("/ws/{room_id}")
-async def websocket_endpoint(websocket: WebSocket, room_id: str, token: str = None):
-    # Accept connection first
-    await websocket.accept()
-    
-    # Then authenticate via query param token
+async def authenticate_websocket(websocket: WebSocket, token: str = None):
+    """Validate the query param token on an accepted socket. Closes it and returns None on failure."""
     try:
         if token is None:
             await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
-            return
+            return None
 
         payload = auth.jwt.decode(token, auth.SECRET_KEY, algorithms=[auth.ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
              await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
-             return
+             return None
     except auth.JWTError:
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
-        return
+        return None
+    return username
 
-    # Add player to game (connection already accepted in manager.connect, so skip that)
-    game = manager.games.get(room_id)
-    if game is None:
-        from poker_engine.game import Game
-        manager.games[room_id] = Game(room_id)
-        manager.active_connections[room_id] = []
-        game = manager.games[room_id]
-    
-    if room_id not in manager.active_connections:
-        manager.active_connections[room_id] = []
-    
-    manager.active_connections[room_id].append(websocket)
-    
-    if username not in [p.username for p in game.players]:
-        game.add_player(username, chips=1000.0)
+@app.get("/stats/export")
+def export_stats():
+    """Columnar snapshot of every player's counters (.npz, one array per column)"""
+    return Response(
+        stats.export_bytes(),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": "attachment; filename=player_stats.npz"},
+    )
+
+@app.get("/stats/{username}")
+def get_player_stats(username: str):
+    """VPIP/PFR/showdown counters, served from memory"""
+    player_stats = stats.get(username)
+    if player_stats is None:
+        raise HTTPException(status_code=404, detail="No stats for this player")
+    return player_stats
+
+@app.get("/metrics")
+def get_metrics():
+    """In-process counters for the realtime layer (rooms, sockets, rate limiting)"""
+    return manager.metrics()
+
+@app.websocket("/ws/{room_id}")
+async def websocket_endpoint(websocket: WebSocket, room_id: str, token: str = None,
+                             resume: str = None, last_seq: int = None, variant: str = None):
+    # Accept connection first (negotiates JSON or binary via subprotocol)
+    await manager.accept(websocket)
     
-    await manager.broadcast(room_id, {"type": "player_joined", "username": username, "state": game.get_state()})
+    # Then authenticate via query param token
+    username = await authenticate_websocket(websocket, token)
+    if username is None:
+        manager.disconnect(websocket, room_id)
+        return
+    if not await manager.admit(websocket, room_id, username):
+        manager.disconnect(websocket, room_id)
+        return
+    # ?variant= (holdem, plo) picks the game when this connection creates the room;
+    # for an existing room it must match. Without it, new rooms are Hold'em.
+    requested = VARIANTS.get(variant or "holdem")
+    if requested is None or (variant is not None and not manager.accepts_variant(room_id, requested)):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        manager.disconnect(websocket, room_id)
+        return
+
+    # Seat the player, or pick up a held seat if they're resuming
+    session = await manager.join(websocket, room_id, username, resume_token=resume, last_seq=last_seq,
+                                 variant=requested)
+    if session is None:
+        return # Table full; join already closed the socket
     
     try:
         while True:
-            data = await websocket.receive_json()
-            await manager.handle_command(room_id, username, data)
+            try:
+                command = await receive_command(websocket)
+            except ProtocolError as e:
+                # Bad input only concerns the sender, and still spends from the action budget
+                if await manager.enforce_rate_limit(websocket, room_id, username, "action"):
+                    await manager.send_personal(websocket, {"type": "error", "message": str(e)})
+                continue
+            await manager.handle_command(room_id, username, command, websocket)
     except WebSocketDisconnect:
-        manager.disconnect(websocket, room_id)
-        await manager.broadcast(room_id, {"type": "player_left", "username": username})
+        manager.leave(websocket, room_id, session)
 
+@app.websocket("/ws/{room_id}/spectate")
+async def spectator_endpoint(websocket: WebSocket, room_id: str, token: str = None):
+    """Read-only, delayed and redacted view of a table. Spectators never take a seat."""
+    await websocket.accept()
+    username = await authenticate_websocket(websocket, token)
+    if username is None:
+        return
+    if not await manager.admit(websocket, room_id, username):
+        return
+
+    await manager.add_spectator(websocket, room_id)
+    try:
+        while True:
+            # Anything a spectator sends is ignored
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        manager.remove_spectator(websocket, room_id)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
@@ -13,7 +13,8 @@ class User(Base):
     chips = Column(Float, default=1000.0) # Start with 1000 chips for fun
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    transactions = relationship("Transaction", back_populates="user")
+    # Never loaded implicitly; page through it with ledger.transactions_page
+    transactions = relationship("Transaction", back_populates="user", lazy="write_only")
 
 class Transaction(Base):
     __tablename__ = "transactions"
@@ -25,3 +26,22 @@ class Transaction(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
 
     user = relationship("User", back_populates="transactions")
+
+    __table_args__ = (
+        # Backs keyset pagination: WHERE user_id = ? AND (timestamp, id) < (?, ?) ORDER BY timestamp DESC, id DESC
+        Index("ix_transactions_user_ts_id", "user_id", "timestamp", "id"),
+    )
+
+class PlayerStats(Base):
+    __tablename__ = "player_stats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    username = Column(String, unique=True, index=True, nullable=False)
+    hands = Column(Integer, default=0, nullable=False)
+    vpip = Column(Integer, default=0, nullable=False)
+    pfr = Column(Integer, default=0, nullable=False)
+    saw_flop = Column(Integer, default=0, nullable=False)
+    saw_showdown = Column(Integer, default=0, nullable=False)
+    won_showdown = Column(Integer, default=0, nullable=False)
+    hands_won = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
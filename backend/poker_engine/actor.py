@@ -0,0 +1,166 @@
+from fastapi import WebSocket
+from typing import List, Optional, Tuple
+from .game import Game
+from .protocol import Command, StartGameCommand, BetCommand
+import asyncio
+import logging
+import os
+
+ROOM_INBOX_SIZE = int(os.getenv("ROOM_INBOX_SIZE", "256"))
+
+logger = logging.getLogger(__name__)
+
+class SeatCommand:
+    """Take a seat at the table. Internal only: queued by the manager on join, never decoded from the wire."""
+    def __init__(self, chips: float):
+        self.chips = chips
+        self.seated: asyncio.Future = asyncio.get_running_loop().create_future() # False if the table was full
+
+class UnseatCommand:
+    """Give up the seat once a disconnected player's grace period runs out. Internal only, like SeatCommand."""
+
+class RoomActor:
+    """
+    The only code that mutates a room's Game.
+    Websocket handlers submit commands (seating a joining player included) to
+    the inbox; one task drains everything
+    that is pending, applies it in arrival order and then emits a single
+    game_update for the whole batch. While that update is being sent, new
+    commands pile up in the inbox and become the next batch.
+    """
+    def __init__(self, room_id: str, game: Game, manager, inbox_size: int = ROOM_INBOX_SIZE):
+        self.room_id = room_id
+        self.game = game
+        self.manager = manager # Needs broadcast_event, send_personal and publish_spectators
+        self.inbox: asyncio.Queue = asyncio.Queue(maxsize=inbox_size)
+        self._task: Optional[asyncio.Task] = None
+        # Metrics
+        self.processed = 0
+        self.batches = 0
+        self.updates = 0
+        self.rejected = 0
+        self.max_depth = 0
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def submit(self, username: str, command: Command, websocket: WebSocket) -> bool:
+        """Queue a command without waiting. Returns False if the inbox is full."""
+        self._ensure_running()
+        try:
+            self.inbox.put_nowait((username, command, websocket))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+        self.max_depth = max(self.max_depth, self.inbox.qsize())
+        return True
+
+    async def seat(self, username: str, chips: float, websocket: WebSocket) -> bool:
+        """
+        Seat a joining player through the inbox. Unlike actions this waits for room in the
+        inbox rather than failing. Returns False if the table is full.
+        """
+        self._ensure_running()
+        command = SeatCommand(chips)
+        await self.inbox.put((username, command, websocket))
+        self.max_depth = max(self.max_depth, self.inbox.qsize())
+        return await command.seated
+
+    async def unseat(self, username: str):
+        self._ensure_running()
+        await self.inbox.put((username, UnseatCommand(), None))
+        self.max_depth = max(self.max_depth, self.inbox.qsize())
+
+    async def _run(self):
+        while True:
+            batch = [await self.inbox.get()]
+            while not self.inbox.empty():
+                batch.append(self.inbox.get_nowait())
+            await self._process(batch)
+
+    def _apply(self, username: str, command: Command) -> Tuple[bool, Optional[str], Optional[dict]]:
+        """Returns (state_changed, error, action_summary)."""
+        if isinstance(command, StartGameCommand):
+            self.game.start_round()
+            return True, None, {"username": username, "action": "start_game"}
+        if isinstance(command, BetCommand):
+            result = self.game.player_action(username, command.action, command.amount)
+            if "error" in result:
+                return False, result["error"], None
+            return True, None, {"username": username, "action": command.action, "amount": command.amount}
+        return False, "Unsupported command", None
+
+    async def _process(self, batch: List[Tuple[str, Command, WebSocket]]):
+        self.batches += 1
+        changed = False
+        actions = []
+        errors = []
+        joined = []
+        left = []
+        for username, command, websocket in batch:
+            self.processed += 1
+            if isinstance(command, SeatCommand):
+                # Re-joining without a resume token keeps the existing seat and chips
+                seated = self.game.add_player(username, command.chips)
+                command.seated.set_result(seated)
+                if seated:
+                    joined.append(username)
+                continue
+            if isinstance(command, UnseatCommand):
+                # Folds them if a hand is running; the seat goes once it's over
+                self.game.remove_player(username)
+                left.append(username)
+                continue
+            try:
+                applied, error, action = self._apply(username, command)
+            except Exception:
+                # One bad command must not take the room down with it
+                logger.exception("Room %s failed to apply %r", self.room_id, command)
+                applied, error, action = False, "Action failed", None
+            changed = changed or applied
+            if action is not None:
+                actions.append(action)
+            if error is not None:
+                errors.append((websocket, error))
+
+        for username in joined:
+            await self.manager.broadcast_event(self.room_id, {
+                "type": "player_joined", "username": username, "state": self.game.get_state()
+            })
+
+        for username in left:
+            await self.manager.broadcast_event(self.room_id, {
+                "type": "player_left", "username": username, "state": self.game.get_state()
+            })
+
+        if changed:
+            self.updates += 1
+            message = {"type": "game_update", "state": self.game.get_state(), "actions": actions}
+            if any(a["action"] == "start_game" for a in actions):
+                message["message"] = "Game Started"
+            await self.manager.broadcast_event(self.room_id, message)
+        if changed or joined or left:
+            self.manager.publish_spectators(self.room_id)
+
+        # Rejected actions didn't change the table, so only their senders hear about it
+        for websocket, error in errors:
+            try:
+                await self.manager.send_personal(websocket, {"type": "error", "message": error})
+            except Exception:
+                pass
+
+    def metrics(self) -> dict:
+        return {
+            "inbox_depth": self.inbox.qsize(),
+            "max_depth": self.max_depth,
+            "processed": self.processed,
+            "batches": self.batches,
+            "updates": self.updates,
+            "rejected": self.rejected,
+        }
+
+    def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,81 @@
+from typing import Awaitable, Callable, Deque, List, Optional
+from collections import deque
+from datetime import datetime
+import asyncio
+import os
+import re
+
+CHAT_HISTORY_SIZE = int(os.getenv("CHAT_HISTORY_SIZE", "50"))
+CHAT_BATCH_WINDOW = float(os.getenv("CHAT_BATCH_WINDOW", "0.05")) # seconds
+CHAT_MAX_LENGTH = int(os.getenv("CHAT_MAX_LENGTH", "280"))
+
+# Extend with CHAT_BANNED_WORDS="word1,word2"
+BANNED_WORDS = frozenset(
+    ["fuck", "shit", "bitch", "cunt", "asshole", "bastard", "dick"]
+    + [w.strip().lower() for w in os.getenv("CHAT_BANNED_WORDS", "").split(",") if w.strip()]
+)
+
+_WORD = re.compile(r"[A-Za-z']+")
+
+class ChatFilter:
+    """Length check plus word masking in a single left-to-right pass over the message."""
+    def __init__(self, max_length: int = CHAT_MAX_LENGTH, banned_words: frozenset = BANNED_WORDS):
+        self.max_length = max_length
+        self.banned_words = banned_words
+
+    def _mask(self, match: re.Match) -> str:
+        word = match.group(0)
+        return "*" * len(word) if word.lower() in self.banned_words else word
+
+    def clean(self, text: str) -> str:
+        # Length is checked before any scanning, so the work is bounded by max_length
+        if len(text) > self.max_length:
+            raise ValueError(f"Message too long (max {self.max_length} characters)")
+        text = text.strip()
+        if not text:
+            raise ValueError("Message is empty")
+        return _WORD.sub(self._mask, text)
+
+class ChatChannel:
+    """
+    Chat for one room, kept off the game-state path.
+    Messages are collected for a short window and delivered as one chat_batch
+    frame per recipient from a separate task, so posting never awaits a send.
+    The last few messages are kept in a ring buffer for late joiners.
+    """
+    def __init__(self, deliver: Callable[[dict], Awaitable[None]], history_size: int = CHAT_HISTORY_SIZE,
+                 window: float = CHAT_BATCH_WINDOW, chat_filter: Optional[ChatFilter] = None):
+        self.deliver = deliver
+        self.window = window
+        self.filter = chat_filter or ChatFilter()
+        self.history: Deque[dict] = deque(maxlen=history_size)
+        self._pending: List[dict] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def post(self, username: str, text: str) -> dict:
+        """Queue a message. Raises ValueError if the filter rejects it."""
+        message = {
+            "username": username,
+            "message": self.filter.clean(text),
+            "timestamp": datetime.now().isoformat()
+        }
+        self.history.append(message)
+        self._pending.append(message)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._flush())
+        return message
+
+    async def _flush(self):
+        while self._pending:
+            await asyncio.sleep(self.window)
+            batch, self._pending = self._pending, []
+            await self.deliver({"type": "chat_batch", "messages": batch})
+
+    def recent(self) -> List[dict]:
+        return list(self.history)
+
+    def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._pending = []
@@ -1,6 +1,7 @@
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from .card import Deck, Card
-from .hand_evaluator import HandEvaluator, HandRank
+from .hand_evaluator import HandRank
+from .variants import GameVariant, HOLDEM
 
 class Player:
     def __init__(self, username: str, chips: float):
@@ -20,8 +21,9 @@ class Player:
         self.has_acted = False
 
 class Game:
-    def __init__(self, room_id: str):
+    def __init__(self, room_id: str, variant: GameVariant = HOLDEM):
         self.room_id = room_id
+        self.variant = variant
         self.players: List[Player] = []
         self.deck = Deck()
         self.community_cards: List[Card] = []
@@ -32,11 +34,52 @@ class Game:
         self.game_stage = "PREFLOP" # PREFLOP, FLOP, TURN, RIVER, SHOWDOWN
         self.is_active = False
         self.winners: List[dict] = []
+        self.showdown = False # Last hand ended with more than one player still in, so hands are shown
+        self.leaving: List[str] = [] # Left mid-hand; dropped from the table once the hand is over
+        # Called as listener(game, event, data) for hand_started, action, stage_advanced, hand_finished
+        self.listeners: List[Callable[["Game", str, dict], None]] = []
 
-    def add_player(self, username: str, chips: float):
+    def _emit(self, event: str, **data):
+        for listener in self.listeners:
+            listener(self, event, data)
+
+    def add_player(self, username: str, chips: float) -> bool:
+        """Seat a player. False if the table is full for this variant; already seated counts as seated."""
         if any(p.username == username for p in self.players):
-            return
+            if username in self.leaving:
+                self.leaving.remove(username) # Came back before the hand ended
+            return True
+        if len(self.players) >= self.variant.max_players:
+            return False
         self.players.append(Player(username, chips))
+        return True
+
+    def remove_player(self, username: str):
+        """Give up a seat. Mid-hand the player folds and is dropped once the hand is over."""
+        player = next((p for p in self.players if p.username == username), None)
+        if player is None:
+            return
+        if not self.is_active:
+            self._drop(player)
+            return
+        self.leaving.append(username)
+        if player.is_folded:
+            return
+        if self.players[self.turn_index] is player:
+            self.player_action(username, "fold")
+            return
+        player.is_folded = True
+        if sum(1 for p in self.players if not p.is_folded) == 1:
+            self._resolve_winner()
+
+    def _drop(self, player: Player):
+        index = self.players.index(player)
+        self.players.remove(player)
+        # Keep the button on the same seat
+        if index < self.dealer_index:
+            self.dealer_index -= 1
+        if self.players:
+            self.dealer_index %= len(self.players)
 
     def start_round(self):
         if len(self.players) < 2:
@@ -49,6 +92,7 @@ class Game:
         self.current_bet = 0.0
         self.game_stage = "PREFLOP"
         self.winners = []
+        self.showdown = False
 
         # Shift dealer
         self.dealer_index = (self.dealer_index + 1) % len(self.players)
@@ -56,7 +100,7 @@ class Game:
         # Reset players and deal
         for p in self.players:
             p.reset_for_round()
-            p.hand = self.deck.deal(2)
+            p.hand = self.deck.deal(self.variant.hole_cards)
             
         # Blinds (Simplified: Dealer is SB, next is BB for 2 players)
         # Assuming SB=10, BB=20
@@ -69,6 +113,7 @@ class Game:
         
         # Action starts after BB (blinds are forced bets, not voluntary actions)
         self.turn_index = (bb_index + 1) % len(self.players)
+        self._emit("hand_started")
 
     def _post_bet(self, player: Player, amount: float):
         if player.chips < amount:
@@ -84,6 +129,8 @@ class Game:
         player = self.players[self.turn_index]
         if player.username != username:
             return {"error": "Not your turn"}
+        stage = self.game_stage
+        chips_before = player.chips
         
         if action == "fold":
             player.is_folded = True
@@ -99,6 +146,9 @@ class Game:
         elif action == "raise":
             if amount <= self.current_bet:
                 return {"error": "Raise must be greater than current bet"}
+            max_raise = self.variant.max_raise_to(self, player)
+            if max_raise is not None and amount > max_raise:
+                return {"error": f"Pot limit: raise to at most {max_raise:g}"}
             to_raise = amount - player.current_bet
             self._post_bet(player, to_raise)
             self.current_bet = amount
@@ -108,6 +158,8 @@ class Game:
                 if p.username != username:
                     p.has_acted = False
             
+        # amount is what actually went in, so a big blind "calling" nothing shows as 0
+        self._emit("action", username=username, action=action, stage=stage, amount=chips_before - player.chips)
         # Move turn
         self._next_turn()
         return {"status": "ok", "game_state": self.get_state()}
@@ -154,8 +206,10 @@ class Game:
             self.community_cards.append(self.deck.deal(1)[0])
         elif self.game_stage == "RIVER":
             self.game_stage = "SHOWDOWN"
+            self._emit("stage_advanced", stage=self.game_stage)
             self._resolve_winner()
             return
+        self._emit("stage_advanced", stage=self.game_stage)
         
         # Reset betting for new stage
         self.current_bet = 0
@@ -167,7 +221,7 @@ class Game:
         self.turn_index = (self.dealer_index + 1) % len(self.players)
 
     def _resolve_winner(self):
-        # Use HandEvaluator
+        # Score hands with the table's variant (Hold'em or Omaha rules)
         best_rank = (-1, [])
         winners = []
         
@@ -179,7 +233,7 @@ class Game:
         else:
             # Evaluate hands
             for p in active_players:
-                rank = HandEvaluator.evaluate(p.hand + self.community_cards)
+                rank = self.variant.evaluate(p.hand, self.community_cards)
                 if rank > best_rank:
                     best_rank = rank
                     winners = [p]
@@ -191,7 +245,7 @@ class Game:
         self.winners = []
         for w in winners:
             # Re-evaluate to get rank for display (optimization: store it earlier)
-            rank = HandEvaluator.evaluate(w.hand + self.community_cards)
+            rank = self.variant.evaluate(w.hand, self.community_cards)
             rank_desc = HandRank.to_string(rank[0])
             self.winners.append({
                 "username": w.username,
@@ -201,10 +255,18 @@ class Game:
             w.chips += share
             
         self.is_active = False
+        self.showdown = len(active_players) > 1
+        self._emit("hand_finished", winners=[w.username for w in winners], showdown=self.showdown)
+        for username in self.leaving:
+            player = next((p for p in self.players if p.username == username), None)
+            if player is not None:
+                self._drop(player)
+        self.leaving = []
 
     def get_state(self):
         return {
             "room_id": self.room_id,
+            "variant": self.variant.name,
             "pot": self.pot,
             "stage": self.game_stage,
             "community_cards": [c.to_dict() for c in self.community_cards],
@@ -220,3 +282,13 @@ class Game:
             } for p in self.players],
             "winners": self.winners
         }
+
+    def get_public_state(self):
+        """State as seen by a spectator: no hole cards until they are shown down."""
+        state = self.get_state()
+        # Not just the SHOWDOWN stage: all-in hands can be settled before the river
+        reveal = not self.is_active and self.showdown
+        for player, p in zip(state["players"], self.players):
+            if not (reveal and not p.is_folded):
+                player["hand"] = []
+        return state
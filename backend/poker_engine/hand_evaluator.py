@@ -1,6 +1,12 @@
 from collections import Counter
 import itertools
 from .card import Card, Rank, Suit, RANK_VALUES
+from .tables import get_tables, unpack_score
+
+# Per-card indexes used by the table lookups
+_RANK_INDEX = {rank: value - 2 for rank, value in RANK_VALUES.items()}
+_SUIT_INDEX = {suit: i for i, suit in enumerate(Suit)}
+_COMBOS = {n: list(itertools.combinations(range(n), 5)) for n in range(5, 8)}
 
 class HandRank(int):
     HIGH_CARD = 1
@@ -40,8 +46,82 @@ class HandEvaluator:
             # Not enough cards to make a hand
             return (0, [])
         
+        if len(cards) in _COMBOS:
+            return unpack_score(HandEvaluator.score(cards))
         return HandEvaluator._get_best_hand(cards)
 
+    @staticmethod
+    def score(cards: list[Card]) -> int:
+        """
+        Best 5-card hand from 5-7 cards as a single int (bigger is better), via the
+        precomputed tables: each 5-card combination is one array lookup.
+        """
+        tables = get_tables()
+        ranks5, flush = tables.ranks5, tables.flush
+        r = [_RANK_INDEX[c.rank] for c in cards]
+        s = [_SUIT_INDEX[c.suit] for c in cards]
+        best = 0
+        for a, b, c, d, e in _COMBOS[len(cards)]:
+            if s[a] == s[b] == s[c] == s[d] == s[e]:
+                value = flush[(1 << r[a]) | (1 << r[b]) | (1 << r[c]) | (1 << r[d]) | (1 << r[e])]
+            else:
+                value = ranks5[(((r[a] * 13 + r[b]) * 13 + r[c]) * 13 + r[d]) * 13 + r[e]]
+            if value > best:
+                best = value
+        return best
+
+    @staticmethod
+    def evaluate_omaha(hole: list[Card], board: list[Card]):
+        """
+        Omaha: best hand using exactly two hole cards and three board cards.
+        Returns the same (HandRank, kickers_list) tuple as evaluate().
+        """
+        if len(hole) < 2 or len(board) < 3:
+            return (0, [])
+        return unpack_score(HandEvaluator.score_omaha(hole, board))
+
+    @staticmethod
+    def score_omaha(hole: list[Card], board: list[Card]) -> int:
+        """
+        Packed score for an Omaha hand. Instead of scoring every two-from-hole and
+        three-from-board hand (60 for PLO on the river), each side is reduced first:
+          - ranks: paired hole cards or a paired board repeat the same rank combos, so
+            both sides are deduped to partial RANKS5 indexes before being crossed
+          - flushes: only looked up when the board has three of a suit and the hand two
+        A suited combo also gets a rank-table score, but that is never above its flush score.
+        """
+        tables = get_tables()
+        ranks5, flush = tables.ranks5, tables.flush
+        hr = [_RANK_INDEX[c.rank] for c in hole]
+        br = [_RANK_INDEX[c.rank] for c in board]
+
+        # RANKS5 accepts ranks in any order, so sort each side to make equal combos equal keys
+        hole_keys = set()
+        for i, j in itertools.combinations(range(len(hr)), 2):
+            a, b = sorted((hr[i], hr[j]))
+            hole_keys.add((a * 13 + b) * 2197)
+        board_keys = set()
+        for i, j, k in itertools.combinations(range(len(br)), 3):
+            a, b, c = sorted((br[i], br[j], br[k]))
+            board_keys.add((a * 13 + b) * 13 + c)
+        best = max(ranks5[h + b] for h in hole_keys for b in board_keys)
+
+        for suit in Suit:
+            board_suited = [r for r, card in zip(br, board) if card.suit == suit]
+            if len(board_suited) < 3:
+                continue
+            hole_suited = [r for r, card in zip(hr, hole) if card.suit == suit]
+            if len(hole_suited) < 2:
+                continue
+            # Ranks within one suit are distinct, so the masks OR together cleanly
+            for a, b in itertools.combinations(hole_suited, 2):
+                hole_mask = (1 << a) | (1 << b)
+                for c, d, e in itertools.combinations(board_suited, 3):
+                    value = flush[hole_mask | (1 << c) | (1 << d) | (1 << e)]
+                    if value > best:
+                        best = value
+        return best
+
     @staticmethod
     def _get_best_hand(cards: list[Card]):
         best_score = (-1, [])
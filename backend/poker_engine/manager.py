@@ -1,70 +1,259 @@
-from fastapi import WebSocket
-from typing import List, Dict
+from fastapi import WebSocket, WebSocketDisconnect, status
+from typing import List, Dict, Optional
 from .game import Game
-from datetime import datetime
-import json
+from .variants import GameVariant, HOLDEM
+from .spectators import SpectatorChannel
+from .protocol import Command, ChatCommand, JSON_CODEC, negotiate_codec
+from .rate_limit import RateLimiter, ALLOW, DELAY, DISCONNECT
+from .chat import ChatChannel
+from .sessions import EventLog, Session, SessionStore
+from .actor import RoomActor
+from .stats import stats
+import asyncio
 
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, List[WebSocket]] = {} # room_id -> [websockets]
         self.games: Dict[str, Game] = {} # room_id -> Game
+        self.actors: Dict[str, RoomActor] = {} # room_id -> serialized command queue for that Game
+        self.spectators: Dict[str, SpectatorChannel] = {} # room_id -> read-only feed
+        self.codecs: Dict[WebSocket, object] = {} # websocket -> negotiated wire codec
+        self.rate_limiter = RateLimiter()
+        self.chats: Dict[str, ChatChannel] = {} # room_id -> chat channel
+        self.event_logs: Dict[str, EventLog] = {} # room_id -> recent game events for resuming clients
+        self.sessions = SessionStore()
 
-    async def connect(self, websocket: WebSocket, room_id: str, username: str):
-        await websocket.accept()
+    async def accept(self, websocket: WebSocket):
+        codec = negotiate_codec(websocket)
+        await websocket.accept(subprotocol=codec.subprotocol)
+        self.codecs[websocket] = codec
+
+    async def admit(self, websocket: WebSocket, room_id: str, username: str) -> bool:
+        # Connection attempts have their own budget; reconnect loops get closed early
+        verdict, wait = self.rate_limiter.acquire("connect", username, room_id)
+        if verdict == DELAY:
+            await asyncio.sleep(wait)
+        elif verdict != ALLOW:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+            return False
+        return True
+
+    async def enforce_rate_limit(self, websocket: WebSocket, room_id: str, username: str, kind: str) -> bool:
+        verdict, wait = self.rate_limiter.acquire(kind, username, room_id)
+        if verdict == ALLOW:
+            return True
+        if verdict == DELAY:
+            await asyncio.sleep(wait)
+            return True
+        if verdict == DISCONNECT:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            # Unwind the receive loop the same way a client hang-up would
+            raise WebSocketDisconnect(status.WS_1008_POLICY_VIOLATION)
+        # Dropped: tell the sender only, never the room
+        await self.send_personal(websocket, {"type": "error", "message": "Rate limit exceeded", "retry_after": round(wait, 2)})
+        return False
+
+    def metrics(self) -> dict:
+        return {
+            "rooms": len(self.games),
+            "connections": sum(len(c) for c in self.active_connections.values()),
+            "spectators": sum(len(c.connections) for c in self.spectators.values()),
+            "held_seats": self.sessions.held(),
+            "rate_limit": self.rate_limiter.metrics(),
+            "room_actors": {room_id: actor.metrics() for room_id, actor in self.actors.items()},
+        }
+
+    def get_chat(self, room_id: str) -> ChatChannel:
+        chat = self.chats.get(room_id)
+        if chat is None:
+            chat = self.chats[room_id] = ChatChannel(lambda message: self.broadcast(room_id, message))
+        return chat
+
+    async def send_chat_history(self, websocket: WebSocket, room_id: str):
+        # Late joiners get the recent backlog, sent to them only
+        chat = self.chats.get(room_id)
+        if chat is not None and chat.history:
+            await self.send_personal(websocket, {"type": "chat_history", "messages": chat.recent()})
+
+    def accepts_variant(self, room_id: str, variant: GameVariant) -> bool:
+        # An existing room keeps its game; asking for a different one is an error, not a silent switch
+        game = self.games.get(room_id)
+        return game is None or game.variant is variant
+
+    def get_or_create_game(self, room_id: str, variant: GameVariant = HOLDEM) -> Game:
+        # The variant only applies when the room is created; after that the table keeps its game
+        if room_id not in self.games:
+            self.games[room_id] = Game(room_id, variant)
+            self.games[room_id].listeners.append(stats.on_event)
+            self.actors[room_id] = RoomActor(room_id, self.games[room_id], self)
         if room_id not in self.active_connections:
             self.active_connections[room_id] = []
-            self.games[room_id] = Game(room_id)
-        
+        return self.games[room_id]
+
+    async def join(self, websocket: WebSocket, room_id: str, username: str,
+                   resume_token: Optional[str] = None, last_seq: Optional[int] = None,
+                   variant: GameVariant = HOLDEM) -> Optional[Session]:
+        """
+        Seat a player's socket in the room.
+        With a valid resume token only the missed events are replayed, to this socket alone;
+        otherwise it's a fresh join announced to the whole room.
+        Returns None (and closes the socket) if the table is full.
+        """
+        game = self.get_or_create_game(room_id, variant)
+        self.active_connections[room_id].append(websocket)
+
+        session = self.sessions.resume(resume_token, username, room_id, websocket) if resume_token else None
+        if session is not None:
+            log = self.event_logs.get(room_id)
+            missed = log.since(last_seq or 0) if log is not None else []
+            if missed is None:
+                # Too far behind for the log: one full snapshot instead
+                await self.send_personal(websocket, {"type": "resync", "state": game.get_state(), "seq": log.last_seq})
+            else:
+                for message in missed:
+                    await self.send_personal(websocket, message)
+            await self.send_personal(websocket, {"type": "session", "resume_token": session.token, "resumed": True})
+            await self.send_chat_history(websocket, room_id)
+            return session
+
+        # The actor seats the player and announces player_joined to the room
+        if not await self.actors[room_id].seat(username, 1000.0, websocket):
+            await self.reject_full(websocket, room_id)
+            return None
+        session = self.sessions.issue(username, room_id, websocket)
+        await self.send_personal(websocket, {"type": "session", "resume_token": session.token, "resumed": False})
+        await self.send_chat_history(websocket, room_id)
+        return session
+
+    async def reject_full(self, websocket: WebSocket, room_id: str):
+        await self.send_personal(websocket, {"type": "error", "message": "Table is full"})
+        self.disconnect(websocket, room_id)
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+
+    def leave(self, websocket: WebSocket, room_id: str, session: Session):
+        # Hold the seat for the grace period; the room only hears about it if they don't come back
+        self.disconnect(websocket, room_id)
+        self.sessions.hold(session.token, lambda: self._release_seat(room_id, session.username), websocket=websocket)
+        self.close_room_if_idle(room_id)
+
+    async def _release_seat(self, room_id: str, username: str):
+        # Grace period ran out. With nobody left to tell, the whole room just goes away.
+        self.close_room_if_idle(room_id)
+        actor = self.actors.get(room_id)
+        if actor is not None:
+            # The actor frees the seat, announces player_left and refreshes spectators
+            await actor.unseat(username)
+
+    def close_room_if_idle(self, room_id: str):
+        """Tear a room down (actor task included) once nobody is seated, holding a seat or watching."""
+        if self.active_connections.get(room_id) or room_id in self.spectators:
+            return
+        if any(s.room_id == room_id for s in self.sessions.sessions.values()):
+            return
+        actor = self.actors.pop(room_id, None)
+        if actor is not None:
+            actor.close()
+        chat = self.chats.pop(room_id, None)
+        if chat is not None:
+            chat.close()
+        self.games.pop(room_id, None)
+        stats.forget_room(room_id)
+        self.event_logs.pop(room_id, None)
+        self.active_connections.pop(room_id, None)
+
+    async def connect(self, websocket: WebSocket, room_id: str, username: str):
+        await self.accept(websocket)
+        self.get_or_create_game(room_id)
         self.active_connections[room_id].append(websocket)
         
-        # Add player to game logic
+        # Add player to game logic, through the actor like every other change to the Game
         # For simplicity, we assume they bring 1000 chips. Real app would deduct from DB.
-        game = self.games[room_id]
-        if username not in [p.username for p in game.players]:
-            game.add_player(username, chips=1000.0)
-        
-        await self.broadcast(room_id, {"type": "player_joined", "username": username, "state": game.get_state()})
+        if not await self.actors[room_id].seat(username, 1000.0, websocket):
+            await self.reject_full(websocket, room_id)
+            return
+        await self.send_chat_history(websocket, room_id)
+
+    async def add_spectator(self, websocket: WebSocket, room_id: str):
+        # Spectators never get a seat, and never create the room either: the first
+        # player picks its variant, and publish_spectators starts the feed once it exists
+        game = self.games.get(room_id)
+        channel = self.spectators.setdefault(room_id, SpectatorChannel())
+        channel.add(websocket)
+        if channel.last_frame is not None:
+            await websocket.send_text(channel.last_frame)
+        elif game is not None:
+            # First viewer: schedule the (delayed) public state for everyone watching
+            channel.publish(game.get_public_state())
+
+    def remove_spectator(self, websocket: WebSocket, room_id: str):
+        channel = self.spectators.get(room_id)
+        if channel is None:
+            return
+        channel.remove(websocket)
+        if not channel.connections:
+            channel.close()
+            del self.spectators[room_id]
+            self.close_room_if_idle(room_id)
+
+    def publish_spectators(self, room_id: str):
+        # One redacted snapshot per state change, shared by every spectator of the room
+        channel = self.spectators.get(room_id)
+        game = self.games.get(room_id)
+        if channel is not None and game is not None:
+            channel.publish(game.get_public_state())
 
     def disconnect(self, websocket: WebSocket, room_id: str):
         if room_id in self.active_connections:
             if websocket in self.active_connections[room_id]:
                 self.active_connections[room_id].remove(websocket)
+        self.codecs.pop(websocket, None)
+
+    async def send_personal(self, websocket: WebSocket, message: dict):
+        codec = self.codecs.get(websocket, JSON_CODEC)
+        await codec.send(websocket, codec.encode(message))
+
+    async def broadcast_event(self, room_id: str, message: dict):
+        # Game events get a sequence number and go in the log so reconnects can catch up
+        log = self.event_logs.get(room_id)
+        if log is None:
+            log = self.event_logs[room_id] = EventLog()
+        await self.broadcast(room_id, log.append(message))
 
     async def broadcast(self, room_id: str, message: dict):
         if room_id in self.active_connections:
+            # Encode once per codec, not once per socket
+            frames = {}
             # Iterate over a copy to avoid modification during iteration issues
             for connection in self.active_connections[room_id].copy():
+                codec = self.codecs.get(connection, JSON_CODEC)
+                frame = frames.get(codec.name)
+                if frame is None:
+                    frame = frames[codec.name] = codec.encode(message)
                 try:
-                    await connection.send_text(json.dumps(message))
+                    await codec.send(connection, frame)
                 except Exception:
                     # Handle disconnected clients
                     self.disconnect(connection, room_id)
 
-    async def handle_command(self, room_id: str, username: str, command: dict):
+    async def handle_command(self, room_id: str, username: str, command: Command, websocket: WebSocket):
         game = self.games.get(room_id)
         if not game:
             return
-        
-        action = command.get("action")
-        amount = command.get("amount", 0)
-
-        # Handle chat messages
-        if action == "chat":
-            message = command.get("message", "")
-            await self.broadcast(room_id, {
-                "type": "chat_message",
-                "username": username,
-                "message": message,
-                "timestamp": datetime.now().isoformat()
-            })
+
+        kind = "chat" if isinstance(command, ChatCommand) else "action"
+        if not await self.enforce_rate_limit(websocket, room_id, username, kind):
             return
-        
-        # Handle game actions
-        if action == "start_game":
-            game.start_round()
-            await self.broadcast(room_id, {"type": "game_update", "state": game.get_state(), "message": "Game Started"})
-        elif action in ["call", "raise", "fold", "check"]:
-            result = game.player_action(username, action, amount)
-            await self.broadcast(room_id, {"type": "game_update", "state": game.get_state(), "result": result})
+
+        # Chat goes to its own batched channel; nothing here waits on sends
+        if isinstance(command, ChatCommand):
+            try:
+                self.get_chat(room_id).post(username, command.message)
+            except ValueError as e:
+                await self.send_personal(websocket, {"type": "error", "message": str(e)})
+            return
+
+        # Game actions are applied in order by the room's actor, which owns the Game
+        if not self.actors[room_id].submit(username, command, websocket):
+            await self.send_personal(websocket, {"type": "error", "message": "Room is busy, try again"})
 
 manager = ConnectionManager()
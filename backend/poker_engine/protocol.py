@@ -0,0 +1,127 @@
+from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+from typing import Annotated, List, Literal, Optional, TypedDict, Union
+import json
+
+try:
+    import msgpack
+except ImportError: # Binary protocol is optional
+    msgpack = None
+
+# --- Commands (client -> server) ---
+
+class StartGameCommand(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    action: Literal["start_game"]
+
+class BetCommand(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    action: Literal["call", "raise", "fold", "check"]
+    amount: float = Field(default=0, ge=0, allow_inf_nan=False) # inf/NaN would make the next state invalid JSON
+
+class ChatCommand(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    action: Literal["chat"]
+    message: str = ""
+
+Command = Annotated[Union[StartGameCommand, BetCommand, ChatCommand], Field(discriminator="action")]
+
+# Built once at import; pydantic-core compiles the validator so each message is
+# parsed and checked in a single pass instead of json.loads + dict poking.
+COMMAND_ADAPTER = TypeAdapter(Command)
+
+# --- Events (server -> client) ---
+# Plain dicts on the hot path; these only document the shapes.
+
+class GameUpdateEvent(TypedDict, total=False):
+    type: Literal["game_update"]
+    state: dict
+    actions: List[dict] # Every command applied since the previous update, in order
+    message: str
+
+class PlayerEvent(TypedDict, total=False):
+    type: Literal["player_joined", "player_left"]
+    username: str
+    state: dict
+
+class ChatMessage(TypedDict):
+    username: str
+    message: str
+    timestamp: str
+
+class ChatBatchEvent(TypedDict):
+    type: Literal["chat_batch", "chat_history"]
+    messages: List[ChatMessage]
+
+class ErrorEvent(TypedDict):
+    type: Literal["error"]
+    message: str
+
+class ProtocolError(ValueError):
+    pass
+
+def _describe(error: ValidationError) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"]) or "command"
+    return f"Invalid command ({location}): {first['msg']}"
+
+def decode_command(frame: Union[str, bytes], binary: bool = False) -> Command:
+    """Validate one websocket frame. Text frames are JSON, binary frames are MessagePack."""
+    try:
+        if binary:
+            if msgpack is None:
+                raise ProtocolError("Binary frames are not supported by this server")
+            return COMMAND_ADAPTER.validate_python(msgpack.unpackb(frame, raw=False))
+        return COMMAND_ADAPTER.validate_json(frame)
+    except ProtocolError:
+        raise
+    except ValidationError as e:
+        raise ProtocolError(_describe(e)) from None
+    except (ValueError, TypeError):
+        # msgpack unpack errors are ValueErrors
+        raise ProtocolError("Malformed frame") from None
+
+async def receive_command(websocket: WebSocket) -> Command:
+    """Like receive_json(), but returns a validated command. Raises ProtocolError on bad input."""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    if message.get("bytes") is not None:
+        return decode_command(message["bytes"], binary=True)
+    return decode_command(message.get("text") or "")
+
+# --- Codecs (outgoing encoding, negotiated per connection) ---
+
+class JsonCodec:
+    name = "json"
+    subprotocol: Optional[str] = None
+
+    def encode(self, message: dict) -> str:
+        return json.dumps(message)
+
+    async def send(self, websocket: WebSocket, frame: str):
+        await websocket.send_text(frame)
+
+class MsgpackCodec:
+    name = "msgpack"
+    subprotocol: Optional[str] = "pokerverse.msgpack.v1"
+
+    def encode(self, message: dict) -> bytes:
+        return msgpack.packb(message, use_bin_type=True)
+
+    async def send(self, websocket: WebSocket, frame: bytes):
+        await websocket.send_bytes(frame)
+
+JSON_CODEC = JsonCodec()
+MSGPACK_CODEC = MsgpackCodec()
+
+def supported_codecs() -> List[Union[JsonCodec, MsgpackCodec]]:
+    return [MSGPACK_CODEC, JSON_CODEC] if msgpack is not None else [JSON_CODEC]
+
+def negotiate_codec(websocket: WebSocket) -> Union[JsonCodec, MsgpackCodec]:
+    """Pick the codec from the Sec-WebSocket-Protocol list the client offered. JSON is the default."""
+    requested = websocket.scope.get("subprotocols") or []
+    for codec in supported_codecs():
+        if codec.subprotocol is not None and codec.subprotocol in requested:
+            return codec
+    return JSON_CODEC
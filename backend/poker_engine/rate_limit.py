@@ -0,0 +1,135 @@
+from typing import Callable, Dict, Optional, Tuple
+import os
+import time
+
+ALLOW = "allow"
+DELAY = "delay"
+DROP = "drop"
+DISCONNECT = "disconnect"
+
+class Budget:
+    """
+    rate/burst apply per (user, room). room_rate/room_burst optionally cap the
+    whole room on top of that. penalty is what happens once the bucket is empty.
+    """
+    def __init__(self, rate: float, burst: float, penalty: str = DROP,
+                 room_rate: Optional[float] = None, room_burst: Optional[float] = None,
+                 max_delay: float = 1.0):
+        if penalty not in (DELAY, DROP, DISCONNECT):
+            raise ValueError(f"Unknown penalty: {penalty}")
+        self.rate = rate
+        self.burst = burst
+        self.penalty = penalty
+        self.room_rate = room_rate
+        self.room_burst = room_burst
+        self.max_delay = max_delay # Waits longer than this are dropped instead
+
+def _budget_from_env(kind: str, default: Budget) -> Budget:
+    # e.g. RATE_LIMIT_CHAT="1,5,drop" -> 1 msg/sec, burst of 5, drop the rest
+    raw = os.getenv(f"RATE_LIMIT_{kind.upper()}")
+    if not raw:
+        return default
+    rate, burst, penalty = raw.split(",")
+    return Budget(float(rate), float(burst), penalty.strip(),
+                  room_rate=default.room_rate, room_burst=default.room_burst, max_delay=default.max_delay)
+
+RATE_LIMIT_SWEEP_SECONDS = float(os.getenv("RATE_LIMIT_SWEEP_SECONDS", "60"))
+
+DEFAULT_BUDGETS = {
+    "chat": _budget_from_env("chat", Budget(rate=1, burst=5, penalty=DROP, room_rate=10, room_burst=30)),
+    "action": _budget_from_env("action", Budget(rate=2, burst=6, penalty=DELAY)),
+    "connect": _budget_from_env("connect", Budget(rate=0.2, burst=5, penalty=DISCONNECT)),
+}
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+    def refill(self, now: float, rate: float, burst: float):
+        # Lazy refill: tokens are topped up only when the bucket is looked at
+        self.tokens = min(burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+
+class RateLimiter:
+    """
+    In-memory token buckets keyed by (kind, user, room) and (kind, room).
+    Every check is a couple of dict lookups and some arithmetic; there is no
+    background refill task. Buckets that have refilled completely are swept out
+    now and then: a fresh bucket starts full, so dropping them changes nothing.
+    """
+    def __init__(self, budgets: Optional[Dict[str, Budget]] = None, clock: Callable[[], float] = time.monotonic,
+                 sweep_interval: float = RATE_LIMIT_SWEEP_SECONDS):
+        self.budgets = budgets if budgets is not None else DEFAULT_BUDGETS
+        self.clock = clock
+        self.sweep_interval = sweep_interval
+        self.buckets: Dict[tuple, TokenBucket] = {}
+        self._last_sweep = clock()
+        self.rejected: Dict[str, int] = {kind: 0 for kind in self.budgets}
+        self.delayed: Dict[str, int] = {kind: 0 for kind in self.budgets}
+
+    def _bucket(self, key: tuple, burst: float, now: float) -> TokenBucket:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(burst, now)
+        return bucket
+
+    def acquire(self, kind: str, username: str, room_id: str) -> Tuple[str, float]:
+        """
+        Take one token for this event.
+        Returns (verdict, wait): verdict is ALLOW, or the budget's penalty;
+        wait is how long the caller should sleep (DELAY) or how long until a retry would pass.
+        """
+        budget = self.budgets[kind]
+        now = self.clock()
+        if now - self._last_sweep >= self.sweep_interval:
+            self.sweep(now)
+
+        user = self._bucket((kind, username, room_id), budget.burst, now)
+        user.refill(now, budget.rate, budget.burst)
+        room = None
+        if budget.room_rate is not None:
+            room = self._bucket((kind, room_id), budget.room_burst, now)
+            room.refill(now, budget.room_rate, budget.room_burst)
+
+        if user.tokens >= 1 and (room is None or room.tokens >= 1):
+            user.tokens -= 1
+            if room is not None:
+                room.tokens -= 1
+            return ALLOW, 0.0
+
+        wait = max((1 - user.tokens) / budget.rate,
+                   (1 - room.tokens) / budget.room_rate if room is not None else 0.0)
+        if budget.penalty == DELAY and wait <= budget.max_delay:
+            # Reserve the future token so a burst of delayed events is spaced out
+            user.tokens -= 1
+            if room is not None:
+                room.tokens -= 1
+            self.delayed[kind] += 1
+            return DELAY, wait
+
+        self.rejected[kind] += 1
+        return (DROP if budget.penalty == DELAY else budget.penalty), wait
+
+    def sweep(self, now: Optional[float] = None):
+        """Drop idle buckets that are full again. Partly drained ones stay, so reconnecting never resets a budget."""
+        now = self.clock() if now is None else now
+        self._last_sweep = now
+        idle = []
+        for key, bucket in self.buckets.items():
+            budget = self.budgets[key[0]]
+            # (kind, room) keys are the room-wide budget, (kind, user, room) the per-user one
+            rate, burst = (budget.room_rate, budget.room_burst) if len(key) == 2 else (budget.rate, budget.burst)
+            if bucket.tokens + (now - bucket.updated) * rate >= burst:
+                idle.append(key)
+        for key in idle:
+            del self.buckets[key]
+
+    def metrics(self) -> dict:
+        return {
+            "rejected": dict(self.rejected),
+            "delayed": dict(self.delayed),
+            "buckets": len(self.buckets),
+        }
@@ -0,0 +1,91 @@
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from collections import deque
+import asyncio
+import os
+import secrets
+
+SESSION_GRACE_SECONDS = float(os.getenv("SESSION_GRACE_SECONDS", "30"))
+EVENT_LOG_SIZE = int(os.getenv("EVENT_LOG_SIZE", "128"))
+
+class EventLog:
+    """Ring buffer of the last room events, each stamped with a per-room sequence number."""
+    def __init__(self, size: int = EVENT_LOG_SIZE):
+        self.events: Deque[Tuple[int, dict]] = deque(maxlen=size)
+        self.last_seq = 0
+
+    def append(self, message: dict) -> dict:
+        self.last_seq += 1
+        message["seq"] = self.last_seq
+        self.events.append((self.last_seq, message))
+        return message
+
+    def since(self, seq: int) -> Optional[List[dict]]:
+        """Events after `seq`, or None if some of them already fell out of the buffer."""
+        if seq >= self.last_seq:
+            return []
+        if not self.events or self.events[0][0] > seq + 1:
+            return None
+        return [message for event_seq, message in self.events if event_seq > seq]
+
+class Session:
+    def __init__(self, token: str, username: str, room_id: str):
+        self.token = token
+        self.username = username
+        self.room_id = room_id
+        self.websocket = None # The socket currently holding the seat
+        self.expiry: Optional[asyncio.Task] = None # Set while the player is disconnected
+
+class SessionStore:
+    """
+    Resume tokens for seated players.
+    When a socket drops the seat is held for `grace` seconds; resuming within
+    that window cancels the pending expiry so the room never sees the player leave.
+    """
+    def __init__(self, grace: float = SESSION_GRACE_SECONDS):
+        self.grace = grace
+        self.sessions: Dict[str, Session] = {} # token -> session
+
+    def issue(self, username: str, room_id: str, websocket=None) -> Session:
+        # A fresh join replaces any earlier session for this seat, so its grace timer can't release it later
+        for old in [s for s in self.sessions.values() if s.username == username and s.room_id == room_id]:
+            if old.expiry is not None:
+                old.expiry.cancel()
+            del self.sessions[old.token]
+        session = Session(secrets.token_urlsafe(16), username, room_id)
+        session.websocket = websocket
+        self.sessions[session.token] = session
+        return session
+
+    def resume(self, token: str, username: str, room_id: str, websocket=None) -> Optional[Session]:
+        session = self.sessions.get(token)
+        # The token only works for the same authenticated user at the same table
+        if session is None or session.username != username or session.room_id != room_id:
+            return None
+        if session.expiry is not None:
+            session.expiry.cancel()
+            session.expiry = None
+        session.websocket = websocket
+        return session
+
+    def hold(self, token: str, on_expire: Callable[[], Awaitable[None]], websocket=None):
+        """
+        Start the grace period; on_expire runs if the player doesn't come back in time.
+        A socket that closes after the player already resumed elsewhere is ignored.
+        """
+        session = self.sessions.get(token)
+        if session is None:
+            return
+        if websocket is not None and session.websocket is not websocket:
+            return
+        if session.expiry is not None:
+            session.expiry.cancel()
+        session.websocket = None
+        session.expiry = asyncio.get_running_loop().create_task(self._expire(session, on_expire))
+
+    async def _expire(self, session: Session, on_expire: Callable[[], Awaitable[None]]):
+        await asyncio.sleep(self.grace)
+        self.sessions.pop(session.token, None)
+        await on_expire()
+
+    def held(self) -> int:
+        return sum(1 for s in self.sessions.values() if s.expiry is not None)
@@ -0,0 +1,90 @@
+from fastapi import WebSocket
+from typing import List, Optional, Deque, Tuple
+from collections import deque
+import asyncio
+import json
+import os
+
+# Spectator feed tuning (seconds). Featured tables usually want a delay so the
+# public stream can't be used to relay hole-card timing back to a seated player.
+SPECTATOR_DELAY = float(os.getenv("SPECTATOR_DELAY", "0"))
+SPECTATOR_INTERVAL = float(os.getenv("SPECTATOR_INTERVAL", "0.1"))
+# Above this many spectators updates are coalesced over the slower interval
+SPECTATOR_LARGE_AUDIENCE = int(os.getenv("SPECTATOR_LARGE_AUDIENCE", "500"))
+SPECTATOR_LARGE_INTERVAL = float(os.getenv("SPECTATOR_LARGE_INTERVAL", "1.0"))
+
+class SpectatorChannel:
+    """
+    Read-only fan-out for one room.
+    Each update is serialized once and the same frame is sent to every spectator.
+    Updates are held back for `delay` seconds and coalesced so that at most one
+    frame per interval goes out, no matter how many actions happen at the table.
+    """
+    def __init__(self, delay: float = SPECTATOR_DELAY, interval: float = SPECTATOR_INTERVAL,
+                 large_audience: int = SPECTATOR_LARGE_AUDIENCE, large_interval: float = SPECTATOR_LARGE_INTERVAL):
+        self.delay = delay
+        self.interval = interval
+        self.large_audience = large_audience
+        self.large_interval = large_interval
+        self.connections: List[WebSocket] = []
+        self.last_frame: Optional[str] = None # Last frame actually delivered (already delayed)
+        self._pending: Deque[Tuple[float, str]] = deque() # (due_time, frame)
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, websocket: WebSocket):
+        self.connections.append(websocket)
+
+    def remove(self, websocket: WebSocket):
+        if websocket in self.connections:
+            self.connections.remove(websocket)
+
+    def current_interval(self) -> float:
+        if len(self.connections) > self.large_audience:
+            return max(self.interval, self.large_interval)
+        return self.interval
+
+    def publish(self, state: dict):
+        # Nobody watching: don't even serialize
+        if not self.connections:
+            return
+        frame = json.dumps({"type": "spectator_update", "state": state})
+        loop = asyncio.get_running_loop()
+        self._pending.append((loop.time() + self.delay, frame))
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            due, _ = self._pending[0]
+            wait = due - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            # Coalesce: only the newest frame that is already due goes out
+            now = loop.time()
+            frame = None
+            while self._pending and self._pending[0][0] <= now:
+                frame = self._pending.popleft()[1]
+            if frame is None:
+                continue
+
+            self.last_frame = frame
+            await self._send_all(frame)
+            await asyncio.sleep(self.current_interval())
+
+    async def _send_all(self, frame: str):
+        connections = self.connections.copy()
+        results = await asyncio.gather(
+            *(connection.send_text(frame) for connection in connections),
+            return_exceptions=True
+        )
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.remove(connection)
+
+    def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._pending.clear()
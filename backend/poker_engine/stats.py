@@ -0,0 +1,158 @@
+from array import array
+from typing import BinaryIO, Dict, List, Optional, Tuple
+import io
+import os
+import sys
+import zipfile
+
+STATS_FLUSH_SECONDS = float(os.getenv("STATS_FLUSH_SECONDS", "60"))
+STATS_EXPORT_DIR = os.getenv("STATS_EXPORT_DIR") # Write an .npz snapshot on every flush if set
+
+# One uint32 column per counter; a player is just a row index into all of them
+COLUMNS = ("hands", "vpip", "pfr", "saw_flop", "saw_showdown", "won_showdown", "hands_won")
+
+_VPIP = 1
+_PFR = 2
+
+def _npy(values: bytes, descr: str, count: int) -> bytes:
+    """Serialize a 1-D array in NumPy's .npy v1.0 format (so numpy.load reads it without us needing numpy)."""
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({count},), }}"
+    # Magic (6) + version (2) + header length (2) + header must be a multiple of 64
+    padding = 64 - (10 + len(header) + 1) % 64
+    header = header + " " * (padding % 64) + "\n"
+    return b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header.encode("latin1") + values
+
+class StatsCollector:
+    """
+    Running VPIP/PFR/showdown counters for every player seen by this process.
+    Fed by Game events; keeps only fixed-width columns plus a per-hand bitmask
+    for the seats of hands in progress, so nothing grows with the number of hands.
+    """
+    def __init__(self):
+        self.index: Dict[str, int] = {} # username -> row
+        self.usernames: List[str] = []
+        self.columns: Dict[str, array] = {name: array("I") for name in COLUMNS}
+        self.flushed: Dict[str, array] = {name: array("I") for name in COLUMNS} # Values already in the DB
+        self.dirty: set = set()
+        self._hand_flags: Dict[str, Dict[int, int]] = {} # room_id -> row -> VPIP/PFR bits for the current hand
+
+    def _row(self, username: str) -> int:
+        row = self.index.get(username)
+        if row is None:
+            row = self.index[username] = len(self.usernames)
+            self.usernames.append(username)
+            for name in COLUMNS:
+                self.columns[name].append(0)
+                self.flushed[name].append(0)
+        return row
+
+    def _bump(self, name: str, row: int):
+        self.columns[name][row] += 1
+        self.dirty.add(row)
+
+    def on_event(self, game, event: str, data: dict):
+        if event == "hand_started":
+            self._hand_flags[game.room_id] = {}
+            for p in game.players:
+                self._bump("hands", self._row(p.username))
+        elif event == "action":
+            # Only money put in voluntarily counts: a big blind calling 0 is really a check
+            if data["stage"] != "PREFLOP" or data["action"] not in ("call", "raise") or data["amount"] <= 0:
+                return
+            row = self._row(data["username"])
+            flags = self._hand_flags.setdefault(game.room_id, {})
+            seen = flags.get(row, 0)
+            if not seen & _VPIP:
+                self._bump("vpip", row)
+            if data["action"] == "raise" and not seen & _PFR:
+                self._bump("pfr", row)
+                seen |= _PFR
+            flags[row] = seen | _VPIP
+        elif event == "stage_advanced":
+            if data["stage"] == "FLOP":
+                for p in game.players:
+                    if not p.is_folded:
+                        self._bump("saw_flop", self._row(p.username))
+        elif event == "hand_finished":
+            self._hand_flags.pop(game.room_id, None)
+            if data["showdown"]:
+                for p in game.players:
+                    if not p.is_folded:
+                        self._bump("saw_showdown", self._row(p.username))
+                for username in data["winners"]:
+                    self._bump("won_showdown", self._row(username))
+            for username in data["winners"]:
+                self._bump("hands_won", self._row(username))
+
+    def forget_room(self, room_id: str):
+        # A room torn down mid-hand never sends hand_finished
+        self._hand_flags.pop(room_id, None)
+
+    def get(self, username: str) -> Optional[dict]:
+        row = self.index.get(username)
+        if row is None:
+            return None
+        stats = {name: self.columns[name][row] for name in COLUMNS}
+        hands = stats["hands"] or 1
+        stats["vpip_pct"] = round(100 * stats["vpip"] / hands, 1)
+        stats["pfr_pct"] = round(100 * stats["pfr"] / hands, 1)
+        stats["wsd_pct"] = round(100 * stats["won_showdown"] / (stats["saw_showdown"] or 1), 1)
+        return {"username": username, **stats}
+
+    # --- Persistence ---
+
+    def load(self, rows: List[dict]):
+        """Seed lifetime totals from the database (rows of username + COLUMNS)."""
+        for data in rows:
+            row = self._row(data["username"])
+            for name in COLUMNS:
+                value = data.get(name) or 0
+                self.columns[name][row] += value
+                self.flushed[name][row] += value
+
+    def take_dirty(self) -> List[Tuple[str, Dict[str, int]]]:
+        """Deltas since the last flush, marked as flushed. Call on the event loop, write them anywhere."""
+        batch = []
+        for row in self.dirty:
+            deltas = {}
+            for name in COLUMNS:
+                delta = self.columns[name][row] - self.flushed[name][row]
+                if delta:
+                    deltas[name] = delta
+                    self.flushed[name][row] = self.columns[name][row]
+            if deltas:
+                batch.append((self.usernames[row], deltas))
+        self.dirty = set()
+        return batch
+
+    def requeue(self, batch: List[Tuple[str, Dict[str, int]]]):
+        # A failed write: put the deltas back so the next flush retries them
+        for username, deltas in batch:
+            row = self.index[username]
+            for name, delta in deltas.items():
+                self.flushed[name][row] -= delta
+            self.dirty.add(row)
+
+    def export_npz(self, fileobj: BinaryIO):
+        """Columnar snapshot: one .npy per counter plus 'username', readable with numpy.load()."""
+        count = len(self.usernames)
+        width = max((len(u) for u in self.usernames), default=1)
+        names = "".join(u.ljust(width, "\0") for u in self.usernames).encode("utf-32-le")
+        with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED) as npz:
+            npz.writestr("username.npy", _npy(names, f"<U{width}", count))
+            for name in COLUMNS:
+                column = self.columns[name]
+                values = column.tobytes() if sys.byteorder == "little" else _swapped(column)
+                npz.writestr(f"{name}.npy", _npy(values, "<u4", count))
+
+    def export_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        self.export_npz(buffer)
+        return buffer.getvalue()
+
+def _swapped(column: array) -> bytes:
+    copy = array(column.typecode, column)
+    copy.byteswap()
+    return copy.tobytes()
+
+stats = StatsCollector()
@@ -0,0 +1,211 @@
+"""
+Lookup tables for the hand evaluator.
+
+Two uint32 tables, scores packed so that a bigger int is a better hand:
+  RANKS5 - 13**5 entries, indexed by the five rank indexes (any order) of a non-flush hand
+  FLUSH  - 8192 entries, indexed by the 13-bit rank mask of a five-card flush
+
+They are built once into a versioned binary file and mmapped read-only, so
+every worker process on a host shares the same physical pages. Build it ahead
+of deploys with:
+
+    python -m poker_engine.tables
+
+If the file is missing the first process to need it builds it under a file
+lock while the others wait, then everyone maps the result.
+"""
+from array import array
+from typing import Optional
+import itertools
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+    import msvcrt
+
+TABLE_VERSION = 1
+MAGIC = b"PVEVAL\0\0"
+HEADER = struct.Struct("<8sIII") # magic, version, len(RANKS5), len(FLUSH)
+HEADER_SIZE = 32 # Header padded so the tables start aligned
+
+RANKS5_SIZE = 13 ** 5
+FLUSH_SIZE = 1 << 13
+
+DEFAULT_PATH = os.getenv(
+    "EVAL_TABLES_PATH",
+    os.path.join(os.path.dirname(__file__), "data", f"eval_tables.v{TABLE_VERSION}.bin")
+)
+
+# Score layout: category << 20, then up to five 4-bit rank values, most significant first
+def pack_score(category: int, kickers: list) -> int:
+    score = category
+    for i in range(5):
+        score = (score << 4) | (kickers[i] if i < len(kickers) else 0)
+    return score
+
+def unpack_score(score: int) -> tuple:
+    """Back to the (HandRank, kickers) tuple the rest of the engine uses."""
+    kickers = [(score >> shift) & 0xF for shift in (16, 12, 8, 4, 0)]
+    return (score >> 20, [k for k in kickers if k])
+
+def _score_ranks(values: list, flush: bool) -> int:
+    # Same rules as HandEvaluator._score_five_cards, on rank values 2..14
+    from .hand_evaluator import HandRank
+    ranks = sorted(values, reverse=True)
+    counts = {}
+    for r in ranks:
+        counts[r] = counts.get(r, 0) + 1
+    straight = None
+    if len(counts) == 5:
+        if ranks[0] - ranks[4] == 4:
+            straight = ranks
+        elif ranks == [14, 5, 4, 3, 2]:
+            straight = [5, 4, 3, 2, 1]
+
+    if flush:
+        if straight is not None:
+            category = HandRank.ROYAL_FLUSH if straight[0] == 14 else HandRank.STRAIGHT_FLUSH
+            return pack_score(category, straight)
+        return pack_score(HandRank.FLUSH, ranks)
+
+    # Group by (count, rank) so quads/trips/pairs come first, then kickers high to low
+    groups = sorted(counts.items(), key=lambda rc: (rc[1], rc[0]), reverse=True)
+    shape = [c for _, c in groups]
+    ordered = [r for r, _ in groups]
+    if shape[0] == 4:
+        return pack_score(HandRank.FOUR_OF_A_KIND, ordered)
+    if shape[:2] == [3, 2]:
+        return pack_score(HandRank.FULL_HOUSE, ordered)
+    if straight is not None:
+        return pack_score(HandRank.STRAIGHT, straight)
+    if shape[0] == 3:
+        return pack_score(HandRank.THREE_OF_A_KIND, ordered)
+    if shape[:2] == [2, 2]:
+        return pack_score(HandRank.TWO_PAIR, ordered)
+    if shape[0] == 2:
+        return pack_score(HandRank.PAIR, ordered)
+    return pack_score(HandRank.HIGH_CARD, ranks)
+
+def build_tables():
+    ranks5 = array("I", bytes(4 * RANKS5_SIZE))
+    # Score each rank multiset once, then fill in every ordering of it
+    for multiset in itertools.combinations_with_replacement(range(13), 5):
+        if multiset[0] == multiset[4]:
+            continue # Five of a kind can't happen
+        score = _score_ranks([r + 2 for r in multiset], flush=False)
+        for order in set(itertools.permutations(multiset)):
+            a, b, c, d, e = order
+            ranks5[(((a * 13 + b) * 13 + c) * 13 + d) * 13 + e] = score
+
+    flush = array("I", bytes(4 * FLUSH_SIZE))
+    for distinct in itertools.combinations(range(13), 5):
+        mask = 0
+        for r in distinct:
+            mask |= 1 << r
+        flush[mask] = _score_ranks([r + 2 for r in distinct], flush=True)
+    return ranks5, flush
+
+def write_tables(path: str = DEFAULT_PATH):
+    ranks5, flush = build_tables()
+    if sys.byteorder != "little":
+        ranks5.byteswap()
+        flush.byteswap()
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    # Write to a temp file and rename, so readers never see a half-written table
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".eval_tables.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, TABLE_VERSION, RANKS5_SIZE, FLUSH_SIZE).ljust(HEADER_SIZE, b"\0"))
+            f.write(ranks5.tobytes())
+            f.write(flush.tobytes())
+        os.chmod(tmp, 0o644) # mkstemp is owner-only; other workers may run as another user
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+class _FileLock:
+    def __init__(self, path: str):
+        self.path = path
+
+    def __enter__(self):
+        self.f = open(self.path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self.f.fileno(), fcntl.LOCK_EX)
+        else:
+            self.f.seek(0)
+            msvcrt.locking(self.f.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.f.fileno(), fcntl.LOCK_UN)
+        else:
+            self.f.seek(0)
+            msvcrt.locking(self.f.fileno(), msvcrt.LK_UNLCK, 1)
+        self.f.close()
+
+class EvalTables:
+    def __init__(self, ranks5, flush, source: str, mm: Optional[mmap.mmap] = None):
+        self.ranks5 = ranks5
+        self.flush = flush
+        self.source = source # "mmap" or "memory"
+        self._mm = mm
+
+def _map(path: str) -> EvalTables:
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, ranks5_size, flush_size = HEADER.unpack_from(mm, 0)
+    expected = HEADER_SIZE + 4 * (RANKS5_SIZE + FLUSH_SIZE)
+    if (magic != MAGIC or version != TABLE_VERSION or ranks5_size != RANKS5_SIZE
+            or flush_size != FLUSH_SIZE or len(mm) != expected):
+        mm.close()
+        raise ValueError(f"{path} is not a v{TABLE_VERSION} evaluator table file")
+    if sys.byteorder != "little":
+        # Can't share little-endian pages as native ints here; copy instead
+        ranks5 = array("I", mm[HEADER_SIZE:HEADER_SIZE + 4 * RANKS5_SIZE])
+        flush = array("I", mm[HEADER_SIZE + 4 * RANKS5_SIZE:])
+        ranks5.byteswap()
+        flush.byteswap()
+        mm.close()
+        return EvalTables(ranks5, flush, "memory")
+    view = memoryview(mm)
+    ranks5 = view[HEADER_SIZE:HEADER_SIZE + 4 * RANKS5_SIZE].cast("I")
+    flush = view[HEADER_SIZE + 4 * RANKS5_SIZE:].cast("I")
+    return EvalTables(ranks5, flush, "mmap", mm)
+
+def load_tables(path: str = DEFAULT_PATH) -> EvalTables:
+    """Map the table file, building it first (under a lock) if it doesn't exist yet."""
+    if not os.path.exists(path):
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with _FileLock(path + ".lock"):
+                # Another worker may have built it while we waited for the lock
+                if not os.path.exists(path):
+                    write_tables(path)
+        except OSError:
+            # Read-only deploy without a prebuilt file: keep a private copy in memory
+            ranks5, flush = build_tables()
+            return EvalTables(ranks5, flush, "memory")
+    return _map(path)
+
+_tables: Optional[EvalTables] = None
+
+def get_tables() -> EvalTables:
+    global _tables
+    if _tables is None:
+        _tables = load_tables()
+    return _tables
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    write_tables(target)
+    print(f"Wrote {target} ({os.path.getsize(target)} bytes)")
@@ -0,0 +1,32 @@
+from typing import Callable, Dict, List, Optional
+from .card import Card
+from .hand_evaluator import HandEvaluator
+
+NO_LIMIT = "no_limit"
+POT_LIMIT = "pot_limit"
+
+class GameVariant:
+    """
+    What differs between the games a table can run: how many hole cards are
+    dealt, how big a raise may be, and how a hand is made at showdown.
+    """
+    def __init__(self, name: str, hole_cards: int, betting: str,
+                 evaluate: Callable[[List[Card], List[Card]], tuple], max_players: int = 10):
+        self.name = name
+        self.hole_cards = hole_cards
+        self.max_players = max_players # The deck must cover every hand plus a five-card board
+        self.betting = betting # NO_LIMIT or POT_LIMIT
+        self.evaluate = evaluate # (hole, board) -> (HandRank, kickers)
+
+    def max_raise_to(self, game, player) -> Optional[float]:
+        """Largest total bet the player may raise to this street, or None if uncapped."""
+        if self.betting == POT_LIMIT:
+            # Call first, then raise by the size of the pot after the call
+            to_call = game.current_bet - player.current_bet
+            return game.current_bet + game.pot + to_call
+        return None
+
+HOLDEM = GameVariant("holdem", 2, NO_LIMIT, lambda hole, board: HandEvaluator.evaluate(hole + board))
+PLO = GameVariant("plo", 4, POT_LIMIT, HandEvaluator.evaluate_omaha)
+
+VARIANTS: Dict[str, GameVariant] = {v.name: v for v in (HOLDEM, PLO)}
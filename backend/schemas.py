@@ -22,10 +22,13 @@ class TransactionResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class TransactionPage(BaseModel):
+    items: List[TransactionResponse]
+    next_cursor: Optional[str] = None
+
 class UserResponse(UserBase):
     id: int
     chips: float
-    transactions: List[TransactionResponse] = []
 
     class Config:
         from_attributes = True
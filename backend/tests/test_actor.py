@@ -0,0 +1,139 @@
+import sys
+import os
+import asyncio
+
+# Add current dir to path to find poker_engine
+sys.path.append(os.getcwd())
+
+from poker_engine.game import Game
+from poker_engine.actor import RoomActor
+from poker_engine.protocol import decode_command
+
+class FakeManager:
+    def __init__(self):
+        self.events = []
+        self.personal = []
+        self.published = 0
+
+    async def broadcast_event(self, room_id, message):
+        self.events.append(message)
+        await asyncio.sleep(0) # Let senders queue up meanwhile, like a real send would
+
+    async def send_personal(self, websocket, message):
+        self.personal.append((websocket, message))
+
+    def publish_spectators(self, room_id):
+        self.published += 1
+
+def test_burst_is_applied_in_order_with_one_update():
+    async def run():
+        g = Game("r1")
+        g.add_player("Alice", 1000)
+        g.add_player("Bob", 1000)
+        manager = FakeManager()
+        actor = RoomActor("r1", g, manager, inbox_size=8)
+
+        actor.submit("Alice", decode_command('{"action": "start_game"}'), "ws-alice")
+        await asyncio.sleep(0.01)
+        first = g.players[g.turn_index].username
+        second = [p.username for p in g.players if p.username != first][0]
+
+        # Out-of-turn action lands between two valid ones
+        actor.submit(first, decode_command('{"action": "call"}'), "ws-1")
+        actor.submit(first, decode_command('{"action": "check"}'), "ws-1")
+        actor.submit(second, decode_command('{"action": "check"}'), "ws-2")
+        await asyncio.sleep(0.01)
+        actor.close()
+        return g, manager, actor
+
+    g, manager, actor = asyncio.run(run())
+    assert g.game_stage == "FLOP"
+    assert len(manager.events) == 2
+    assert [a["action"] for a in manager.events[1]["actions"]] == ["call", "check"]
+    assert manager.personal == [("ws-1", {"type": "error", "message": "Not your turn"})]
+    assert actor.metrics()["processed"] == 4 and actor.metrics()["batches"] == 2
+
+def test_full_inbox_rejects():
+    async def run():
+        actor = RoomActor("r1", Game("r1"), FakeManager(), inbox_size=2)
+        accepted = [actor.submit("Alice", decode_command('{"action": "fold"}'), None) for _ in range(3)]
+        actor.close()
+        return accepted, actor
+
+    accepted, actor = asyncio.run(run())
+    assert accepted == [True, True, False]
+    assert actor.metrics()["rejected"] == 1
+
+def test_seating_goes_through_the_inbox():
+    async def run():
+        g = Game("r1")
+        manager = FakeManager()
+        actor = RoomActor("r1", g, manager, inbox_size=8)
+        await actor.seat("Alice", 1000, "ws-alice")
+        await actor.seat("Alice", 500, "ws-alice") # Rejoin keeps the seat
+        await asyncio.sleep(0.01)
+        actor.close()
+        return g, manager
+
+    g, manager = asyncio.run(run())
+    assert [(p.username, p.chips) for p in g.players] == [("Alice", 1000)]
+    assert [e["type"] for e in manager.events] == ["player_joined", "player_joined"]
+    assert manager.published >= 1
+
+def test_idle_room_is_torn_down():
+    from poker_engine.manager import ConnectionManager
+
+    async def run():
+        manager = ConnectionManager()
+        manager.get_or_create_game("r1")
+        actor = manager.actors["r1"]
+        await actor.seat("Alice", 1000, None)
+        await asyncio.sleep(0.01)
+        task = actor._task
+
+        # A held seat keeps the room alive
+        session = manager.sessions.issue("Alice", "r1")
+        manager.close_room_if_idle("r1")
+        assert "r1" in manager.games
+
+        manager.sessions.sessions.pop(session.token)
+        manager.close_room_if_idle("r1")
+        await asyncio.sleep(0)
+        return manager, task
+
+    manager, task = asyncio.run(run())
+    assert "r1" not in manager.games and "r1" not in manager.actors
+    assert task.cancelled()
+
+def test_unseat_announces_and_refreshes_spectators():
+    async def run():
+        g = Game("r1")
+        g.add_player("Alice", 1000)
+        g.add_player("Bob", 1000)
+        manager = FakeManager()
+        actor = RoomActor("r1", g, manager, inbox_size=8)
+        await actor.unseat("Bob")
+        await asyncio.sleep(0.01)
+        actor.close()
+        return g, manager
+
+    g, manager = asyncio.run(run())
+    assert [p.username for p in g.players] == ["Alice"]
+    assert manager.events[0]["type"] == "player_left"
+    assert [p["username"] for p in manager.events[0]["state"]["players"]] == ["Alice"]
+    assert manager.published == 1
+
+def test_seat_is_refused_when_table_is_full():
+    async def run():
+        g = Game("r1")
+        for i in range(g.variant.max_players):
+            g.add_player(f"p{i}", 1000)
+        manager = FakeManager()
+        actor = RoomActor("r1", g, manager, inbox_size=8)
+        seated = await actor.seat("late", 1000, "ws-late")
+        actor.close()
+        return seated, manager
+
+    seated, manager = asyncio.run(run())
+    assert seated is False
+    assert manager.events == []
@@ -0,0 +1,39 @@
+import sys
+import os
+import asyncio
+
+# Add current dir to path to find poker_engine
+sys.path.append(os.getcwd())
+
+import pytest
+from poker_engine.chat import ChatChannel, ChatFilter
+
+def test_filter_masks_and_limits():
+    f = ChatFilter(max_length=20, banned_words=frozenset({"darn"}))
+    assert f.clean("  Darn river ") == "**** river"
+    assert f.clean("darnit") == "darnit"
+    with pytest.raises(ValueError):
+        f.clean("x" * 21)
+    with pytest.raises(ValueError):
+        f.clean("   ")
+
+def test_burst_is_one_frame_and_history_is_bounded():
+    frames = []
+
+    async def deliver(message):
+        frames.append(message)
+
+    async def run():
+        chat = ChatChannel(deliver, history_size=3, window=0.01)
+        for i in range(5):
+            chat.post("alice", f"msg {i}")
+        # Posting never waits on delivery
+        assert frames == []
+        await asyncio.sleep(0.05)
+        return chat
+
+    chat = asyncio.run(run())
+    assert len(frames) == 1
+    assert frames[0]["type"] == "chat_batch"
+    assert [m["message"] for m in frames[0]["messages"]] == [f"msg {i}" for i in range(5)]
+    assert [m["message"] for m in chat.recent()] == ["msg 2", "msg 3", "msg 4"]
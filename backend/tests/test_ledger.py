@@ -0,0 +1,50 @@
+import sys
+import os
+import json
+from datetime import datetime, timedelta
+
+# Add current dir to path to find models/ledger
+sys.path.append(os.getcwd())
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import models, ledger
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    user = models.User(username="alice", email="alice@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    start = datetime(2025, 1, 1)
+    # Pairs of rows share a timestamp so the id tie-breaker matters
+    for i in range(25):
+        db.add(models.Transaction(user_id=user.id, amount=i, transaction_type="DEPOSIT",
+                                  timestamp=start + timedelta(minutes=i // 2)))
+    db.commit()
+    db.close()
+    return factory
+
+def test_pages_cover_history_once_newest_first(session_factory):
+    db = session_factory()
+    seen, cursor = [], None
+    while True:
+        rows, cursor = ledger.transactions_page(db, 1, 10, cursor)
+        seen.extend(r.amount for r in rows)
+        if cursor is None:
+            break
+    assert seen == [float(i) for i in reversed(range(25))]
+
+def test_bad_cursor(session_factory):
+    with pytest.raises(ValueError):
+        ledger.transactions_page(session_factory(), 1, 10, "not-a-cursor")
+
+def test_ndjson_export(session_factory):
+    lines = "".join(ledger.export_ndjson(session_factory, 1, chunk_size=7)).splitlines()
+    assert len(lines) == 25
+    assert json.loads(lines[0])["amount"] == 24
@@ -0,0 +1,76 @@
+import sys
+import os
+import random
+import itertools
+
+# Add current dir to path to find poker_engine
+sys.path.append(os.getcwd())
+
+from poker_engine.card import Card, Deck, Rank, Suit
+from poker_engine.game import Game
+from poker_engine.hand_evaluator import HandEvaluator, HandRank
+from poker_engine.variants import PLO
+
+def naive_omaha(hole, board):
+    return max(
+        HandEvaluator._score_five_cards(list(h) + list(b))
+        for h in itertools.combinations(hole, 2)
+        for b in itertools.combinations(board, 3)
+    )
+
+def test_omaha_evaluator_matches_naive_enumeration():
+    random.seed(35)
+    deck = Deck()
+    for _ in range(2000):
+        deck.reset()
+        hole = deck.deal(4)
+        board = deck.deal(random.choice([3, 4, 5]))
+        assert HandEvaluator.evaluate_omaha(hole, board) == naive_omaha(hole, board)
+
+def test_omaha_uses_exactly_two_hole_cards():
+    # Four hearts in hand but only one on the board: no flush in Omaha
+    hole = [Card(Rank.ACE, Suit.HEARTS), Card(Rank.KING, Suit.HEARTS),
+            Card(Rank.QUEEN, Suit.HEARTS), Card(Rank.JACK, Suit.HEARTS)]
+    board = [Card(Rank.TWO, Suit.HEARTS), Card(Rank.SEVEN, Suit.CLUBS), Card(Rank.NINE, Suit.DIAMONDS),
+             Card(Rank.THREE, Suit.SPADES), Card(Rank.FOUR, Suit.CLUBS)]
+    assert HandEvaluator.evaluate_omaha(hole, board)[0] == HandRank.HIGH_CARD
+    # Picking any five of the nine cards would make one
+    assert HandEvaluator._get_best_hand(hole + board)[0] == HandRank.FLUSH
+
+    # Four hearts on the board, one in hand: Hold'em plays it, Omaha can't use a single suited card
+    board = [Card(Rank.TWO, Suit.HEARTS), Card(Rank.SEVEN, Suit.HEARTS), Card(Rank.NINE, Suit.HEARTS),
+             Card(Rank.THREE, Suit.HEARTS), Card(Rank.FOUR, Suit.CLUBS)]
+    hole = [Card(Rank.ACE, Suit.HEARTS), Card(Rank.KING, Suit.CLUBS),
+            Card(Rank.QUEEN, Suit.DIAMONDS), Card(Rank.JACK, Suit.SPADES)]
+    assert HandEvaluator.evaluate(hole[:2] + board)[0] == HandRank.FLUSH
+    assert HandEvaluator.evaluate_omaha(hole, board)[0] == HandRank.HIGH_CARD
+
+def test_plo_deals_four_and_caps_raises_at_pot():
+    game = Game("plo", variant=PLO)
+    game.add_player("a", 1000)
+    game.add_player("b", 1000)
+    game.add_player("c", 1000)
+    game.start_round()
+    assert all(len(p.hand) == 4 for p in game.players)
+    assert game.get_state()["variant"] == "plo"
+
+    # Blinds 10/20, first to act owes 20: call to 20, pot becomes 50, so max raise is to 70
+    actor = game.players[game.turn_index].username
+    result = game.player_action(actor, "raise", 71)
+    assert "error" in result
+    result = game.player_action(actor, "raise", 70)
+    assert result["status"] == "ok"
+    assert game.current_bet == 70
+
+def test_table_size_is_capped_by_variant():
+    game = Game("plo", variant=PLO)
+    assert all(game.add_player(f"p{i}", 1000) for i in range(PLO.max_players))
+    assert game.add_player("one_too_many", 1000) is False
+    assert game.add_player("p0", 1000) is True # Already seated
+
+    # A full table still deals and finishes a hand
+    game.start_round()
+    while game.is_active:
+        player = game.players[game.turn_index]
+        game.player_action(player.username, "call" if player.current_bet < game.current_bet else "check")
+    assert len(game.community_cards) == 5
@@ -0,0 +1,39 @@
+import sys
+import os
+
+# Add current dir to path to find poker_engine
+sys.path.append(os.getcwd())
+
+import pytest
+from poker_engine.protocol import decode_command, ProtocolError, BetCommand, ChatCommand, StartGameCommand, msgpack
+
+def test_json_commands_are_typed():
+    assert isinstance(decode_command('{"action": "start_game"}'), StartGameCommand)
+    cmd = decode_command('{"action": "raise", "amount": 120}')
+    assert isinstance(cmd, BetCommand) and cmd.amount == 120
+    assert decode_command('{"action": "fold"}').amount == 0
+    assert isinstance(decode_command('{"action": "chat", "message": "gg"}'), ChatCommand)
+
+@pytest.mark.parametrize("frame", [
+    "not json",
+    '{"action": "shove"}',
+    '{"action": "raise", "amount": -5}',
+    '{"action": "raise", "amount": "lots"}',
+    '{"action": "raise", "amount": 1e999}',
+    '{"action": "raise", "amount": Infinity}',
+    '{"action": "raise", "amount": NaN}',
+    '{"action": "call", "extra": 1}',
+    '[]',
+])
+def test_bad_commands_are_rejected(frame):
+    with pytest.raises(ProtocolError):
+        decode_command(frame)
+
+@pytest.mark.skipif(msgpack is None, reason="msgpack not installed")
+def test_msgpack_round_trip():
+    frame = msgpack.packb({"action": "raise", "amount": 60})
+    assert decode_command(frame, binary=True).amount == 60
+    with pytest.raises(ProtocolError):
+        decode_command(b"\xc1", binary=True)
+    with pytest.raises(ProtocolError):
+        decode_command(msgpack.packb({"action": "raise", "amount": float("inf")}), binary=True)
@@ -0,0 +1,67 @@
+import sys
+import os
+
+# Add current dir to path to find poker_engine
+sys.path.append(os.getcwd())
+
+from poker_engine.rate_limit import RateLimiter, Budget, ALLOW, DELAY, DROP, DISCONNECT
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_burst_then_lazy_refill():
+    clock = FakeClock()
+    limiter = RateLimiter({"chat": Budget(rate=1, burst=3)}, clock=clock)
+    verdicts = [limiter.acquire("chat", "alice", "r1")[0] for _ in range(4)]
+    assert verdicts == [ALLOW, ALLOW, ALLOW, DROP]
+    # Other users have their own bucket
+    assert limiter.acquire("chat", "bob", "r1")[0] == ALLOW
+    clock.now = 1.0
+    assert limiter.acquire("chat", "alice", "r1")[0] == ALLOW
+    assert limiter.metrics()["rejected"]["chat"] == 1
+
+def test_room_budget_caps_everyone():
+    clock = FakeClock()
+    limiter = RateLimiter({"chat": Budget(rate=1, burst=5, room_rate=1, room_burst=2)}, clock=clock)
+    assert limiter.acquire("chat", "alice", "r1")[0] == ALLOW
+    assert limiter.acquire("chat", "bob", "r1")[0] == ALLOW
+    assert limiter.acquire("chat", "carol", "r1")[0] == DROP
+    assert limiter.acquire("chat", "carol", "r2")[0] == ALLOW
+
+def test_delay_reserves_tokens_and_falls_back_to_drop():
+    clock = FakeClock()
+    limiter = RateLimiter({"action": Budget(rate=2, burst=1, penalty=DELAY, max_delay=1.0)}, clock=clock)
+    assert limiter.acquire("action", "alice", "r1") == (ALLOW, 0.0)
+    assert limiter.acquire("action", "alice", "r1") == (DELAY, 0.5)
+    assert limiter.acquire("action", "alice", "r1") == (DELAY, 1.0)
+    assert limiter.acquire("action", "alice", "r1")[0] == DROP
+
+def test_disconnect_penalty():
+    limiter = RateLimiter({"connect": Budget(rate=0.1, burst=1, penalty=DISCONNECT)}, clock=FakeClock())
+    assert limiter.acquire("connect", "alice", "r1")[0] == ALLOW
+    assert limiter.acquire("connect", "alice", "r1")[0] == DISCONNECT
+
+def test_sweep_drops_only_refilled_buckets():
+    clock = FakeClock()
+    limiter = RateLimiter({"chat": Budget(rate=1, burst=3, room_rate=10, room_burst=30)}, clock=clock, sweep_interval=10)
+    for _ in range(3):
+        limiter.acquire("chat", "alice", "r1")
+    limiter.acquire("chat", "bob", "r2")
+
+    # Bob's and both room buckets have refilled, Alice's hasn't
+    clock.now = 1.5
+    limiter.sweep()
+    assert set(limiter.buckets) == {("chat", "alice", "r1")}
+
+    # Reconnecting doesn't hand Alice a fresh burst
+    assert limiter.acquire("chat", "alice", "r1")[0] == ALLOW
+    assert limiter.acquire("chat", "alice", "r1")[0] == DROP
+
+    # Sweeps also run on their own from acquire()
+    clock.now = 20.0
+    limiter.acquire("chat", "carol", "r1")
+    assert set(limiter.buckets) == {("chat", "carol", "r1"), ("chat", "r1")}
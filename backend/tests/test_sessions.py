@@ -0,0 +1,105 @@
+import sys
+import os
+import asyncio
+
+# Add current dir to path to find poker_engine
+sys.path.append(os.getcwd())
+
+from poker_engine.sessions import EventLog, SessionStore
+
+def test_event_log_replays_only_missed_events():
+    log = EventLog(size=3)
+    for i in range(5):
+        log.append({"type": "game_update", "n": i})
+    assert [m["seq"] for m in log.since(3)] == [4, 5]
+    assert log.since(5) == []
+    # Seq 2 already fell out of the ring buffer
+    assert log.since(1) is None
+
+def test_grace_period():
+    left = []
+
+    async def on_expire():
+        left.append("alice")
+
+    async def run():
+        store = SessionStore(grace=0.02)
+        session = store.issue("alice", "r1")
+        assert store.resume(session.token, "bob", "r1") is None
+        assert store.resume(session.token, "alice", "r2") is None
+
+        # Comes back in time: nobody hears about it
+        store.hold(session.token, on_expire)
+        assert store.held() == 1
+        assert store.resume(session.token, "alice", "r1") is session
+        await asyncio.sleep(0.05)
+        assert left == []
+
+        # Doesn't come back: seat released, token dead
+        store.hold(session.token, on_expire)
+        await asyncio.sleep(0.05)
+        assert left == ["alice"]
+        assert store.resume(session.token, "alice", "r1") is None
+
+    asyncio.run(run())
+
+def test_stale_socket_close_after_resume_keeps_seat():
+    left = []
+
+    async def on_expire():
+        left.append("alice")
+
+    async def run():
+        store = SessionStore(grace=0.02)
+        old_socket, new_socket = object(), object()
+        session = store.issue("alice", "r1", old_socket)
+
+        # Client reconnects before the server notices the old socket died
+        assert store.resume(session.token, "alice", "r1", new_socket) is session
+        store.hold(session.token, on_expire, websocket=old_socket)
+        assert store.held() == 0
+        await asyncio.sleep(0.05)
+        assert left == []
+        assert store.resume(session.token, "alice", "r1", new_socket) is session
+
+        # Holding twice replaces the timer instead of leaving the first one running
+        store.hold(session.token, on_expire, websocket=new_socket)
+        first = session.expiry
+        store.hold(session.token, on_expire)
+        await asyncio.sleep(0)
+        assert first.cancelled()
+        await asyncio.sleep(0.05)
+        assert left == ["alice"]
+
+    asyncio.run(run())
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+def test_rejoin_without_token_keeps_seat():
+    from poker_engine.manager import ConnectionManager
+
+    async def run():
+        manager = ConnectionManager()
+        manager.sessions.grace = 0.02
+        alice_ws1, alice_ws2, bob_ws = FakeSocket(), FakeSocket(), FakeSocket()
+        alice = await manager.join(alice_ws1, "r1", "alice")
+        await manager.join(bob_ws, "r1", "bob")
+        await asyncio.sleep(0.01)
+
+        # Page reload: the old socket drops, then a fresh join without the resume token
+        manager.leave(alice_ws1, "r1", alice)
+        await manager.join(alice_ws2, "r1", "alice")
+        await asyncio.sleep(0.05)
+        game = manager.games["r1"]
+        manager.actors["r1"].close()
+        return game, alice, manager, bob_ws
+
+    game, old_session, manager, bob_ws = asyncio.run(run())
+    assert [p.username for p in game.players] == ["alice", "bob"]
+    assert old_session.token not in manager.sessions.sessions
+    assert not any('"player_left"' in frame for frame in bob_ws.sent)
@@ -0,0 +1,108 @@
+import sys
+import os
+import asyncio
+import json
+
+# Add current dir to path to find poker_engine
+sys.path.append(os.getcwd())
+
+from poker_engine.game import Game
+from poker_engine.spectators import SpectatorChannel
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+def make_game():
+    g = Game("featured")
+    g.add_player("Alice", 1000)
+    g.add_player("Bob", 1000)
+    g.start_round()
+    return g
+
+def test_public_state_hides_hole_cards():
+    g = make_game()
+    assert all(p["hand"] == [] for p in g.get_public_state()["players"])
+    # Player view is untouched
+    assert all(len(p["hand"]) == 2 for p in g.get_state()["players"])
+
+def test_all_in_before_river_is_shown_down():
+    g = Game("featured")
+    g.add_player("Alice", 1000)
+    g.add_player("Bob", 300)
+    g.start_round()
+    g.player_action(g.players[g.turn_index].username, "raise", 1000)
+    g.player_action(g.players[g.turn_index].username, "call")
+    # Settled preflop, never reaching the SHOWDOWN stage
+    assert not g.is_active and g.game_stage == "PREFLOP"
+    assert all(len(p["hand"]) == 2 for p in g.get_public_state()["players"])
+
+def test_fold_win_stays_hidden():
+    g = make_game()
+    g.player_action(g.players[g.turn_index].username, "fold")
+    assert not g.is_active
+    assert all(p["hand"] == [] for p in g.get_public_state()["players"])
+
+def test_leaving_mid_hand_folds_then_frees_the_seat():
+    g = Game("featured")
+    for name in ("Alice", "Bob", "Carol"):
+        g.add_player(name, 1000)
+    g.start_round()
+    waiting = [p.username for p in g.players if p is not g.players[g.turn_index]]
+    g.remove_player(waiting[0])
+    assert g.is_active and len(g.players) == 3
+    g.remove_player(waiting[1])
+    # Only the player to act is left in: they win and the leavers' seats are gone
+    assert not g.is_active
+    assert [p.username for p in g.players] == [w["username"] for w in g.winners]
+
+def test_updates_are_coalesced_and_shared():
+    async def run():
+        g = make_game()
+        channel = SpectatorChannel(delay=0.05, interval=0.05)
+        watchers = [FakeSocket() for _ in range(50)]
+        for w in watchers:
+            channel.add(w)
+
+        # A burst of actions at the table
+        for _ in range(10):
+            channel.publish(g.get_public_state())
+        # Delay not elapsed yet: nothing leaked
+        await asyncio.sleep(0.01)
+        assert all(not w.sent for w in watchers)
+
+        await asyncio.sleep(0.1)
+        channel.close()
+        return watchers
+
+    watchers = asyncio.run(run())
+    assert all(len(w.sent) == 1 for w in watchers)
+    # Every spectator got the very same serialized frame
+    assert len({id(w.sent[0]) for w in watchers}) == 1
+    assert json.loads(watchers[0].sent[0])["type"] == "spectator_update"
+
+if __name__ == "__main__":
+    test_public_state_hides_hole_cards()
+    test_updates_are_coalesced_and_shared()
+
+def test_spectator_does_not_pick_the_room_variant():
+    from poker_engine.manager import ConnectionManager
+    from poker_engine.variants import HOLDEM, PLO
+
+    async def run():
+        manager = ConnectionManager()
+        watcher = FakeSocket()
+        await manager.add_spectator(watcher, "r1")
+        assert "r1" not in manager.games and manager.accepts_variant("r1", PLO)
+
+        manager.get_or_create_game("r1", PLO)
+        assert manager.accepts_variant("r1", PLO)
+        assert not manager.accepts_variant("r1", HOLDEM)
+        # Last viewer gone and nobody seated: the room is torn down
+        manager.remove_spectator(watcher, "r1")
+        assert "r1" not in manager.games and "r1" not in manager.actors
+
+    asyncio.run(run())
@@ -0,0 +1,84 @@
+import sys
+import os
+import io
+import zipfile
+from array import array
+
+# Add current dir to path to find poker_engine
+sys.path.append(os.getcwd())
+
+from poker_engine.game import Game
+from poker_engine.stats import StatsCollector
+
+def play_hand(collector):
+    g = Game("stats_room")
+    g.listeners.append(collector.on_event)
+    for name in ("Alice", "Bob", "Carol"):
+        g.add_player(name, 1000)
+    g.start_round()
+    raiser = g.players[g.turn_index].username
+    g.player_action(raiser, "raise", 60)
+    while g.game_stage == "PREFLOP":
+        g.player_action(g.players[g.turn_index].username, "call")
+    while g.is_active:
+        g.player_action(g.players[g.turn_index].username, "check")
+    return g, raiser
+
+def test_counters():
+    collector = StatsCollector()
+    g, raiser = play_hand(collector)
+    for name in ("Alice", "Bob", "Carol"):
+        s = collector.get(name)
+        assert s["hands"] == 1 and s["vpip"] == 1 and s["saw_flop"] == 1 and s["saw_showdown"] == 1
+        assert s["pfr"] == (1 if name == raiser else 0)
+    assert sum(collector.get(w["username"])["won_showdown"] for w in g.winners) == len(g.winners)
+    assert collector.get("Nobody") is None
+
+def test_big_blind_call_for_nothing_is_not_vpip():
+    collector = StatsCollector()
+    g = Game("stats_room")
+    g.listeners.append(collector.on_event)
+    for name in ("Alice", "Bob", "Carol"):
+        g.add_player(name, 1000)
+    g.start_round()
+    # Everyone limps; the big blind closes the round with a "call" that costs nothing
+    while g.game_stage == "PREFLOP":
+        g.player_action(g.players[g.turn_index].username, "call")
+    big_blind = g.players[(g.dealer_index + 2) % 3].username
+    assert collector.get(big_blind)["vpip"] == 0
+    assert sum(collector.get(n)["vpip"] for n in ("Alice", "Bob", "Carol")) == 2
+
+def test_flush_deltas_and_requeue():
+    collector = StatsCollector()
+    collector.load([{"username": "Alice", "hands": 10, "vpip": 4}])
+    play_hand(collector)
+    batch = dict(collector.take_dirty())
+    assert batch["Alice"]["hands"] == 1
+    assert collector.get("Alice")["hands"] == 11
+    assert collector.take_dirty() == []
+    collector.requeue(list(batch.items()))
+    assert dict(collector.take_dirty()) == batch
+
+def test_npz_export_is_columnar():
+    collector = StatsCollector()
+    play_hand(collector)
+    with zipfile.ZipFile(io.BytesIO(collector.export_bytes())) as npz:
+        raw = npz.read("hands.npy")
+        assert raw.startswith(b"\x93NUMPY\x01\x00")
+        header_len = int.from_bytes(raw[8:10], "little")
+        assert (10 + header_len) % 64 == 0
+        assert b"'<u4'" in raw[10:10 + header_len] and b"(3,)" in raw[10:10 + header_len]
+        assert list(array("I", raw[10 + header_len:])) == [1, 1, 1]
+        assert "username.npy" in npz.namelist()
+
+def test_room_torn_down_mid_hand_is_forgotten():
+    collector = StatsCollector()
+    g = Game("stats_room")
+    g.listeners.append(collector.on_event)
+    for name in ("Alice", "Bob", "Carol"):
+        g.add_player(name, 1000)
+    g.start_round()
+    g.player_action(g.players[g.turn_index].username, "raise", 60)
+    assert "stats_room" in collector._hand_flags
+    collector.forget_room("stats_room")
+    assert collector._hand_flags == {}
@@ -0,0 +1,49 @@
+import sys
+import os
+import random
+import itertools
+
+# Add current dir to path to find poker_engine
+sys.path.append(os.getcwd())
+
+import pytest
+
+from poker_engine.card import Deck
+from poker_engine.hand_evaluator import HandEvaluator
+from poker_engine import tables
+
+def brute_force(cards):
+    return max(HandEvaluator._score_five_cards(list(h)) for h in itertools.combinations(cards, 5))
+
+def test_table_evaluator_matches_brute_force():
+    random.seed(7)
+    deck = Deck()
+    for _ in range(3000):
+        deck.reset()
+        cards = deck.deal(random.choice([5, 6, 7]))
+        assert HandEvaluator.evaluate(cards) == brute_force(cards)
+
+def test_packed_scores_order_like_tuples():
+    random.seed(11)
+    deck = Deck()
+    hands = []
+    for _ in range(300):
+        deck.reset()
+        hands.append(deck.deal(7))
+    by_score = sorted(hands, key=HandEvaluator.score)
+    assert [brute_force(h) for h in by_score] == sorted(brute_force(h) for h in hands)
+
+def test_file_is_built_once_then_mapped(tmp_path):
+    path = str(tmp_path / "tables.bin")
+    first = tables.load_tables(path)
+    assert first.source == "mmap" and os.path.exists(path)
+    mtime = os.path.getmtime(path)
+    second = tables.load_tables(path)
+    assert os.path.getmtime(path) == mtime
+    assert second.ranks5[12345] == first.ranks5[12345]
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / "bad.bin"
+    path.write_bytes(b"not a table" * 10)
+    with pytest.raises(ValueError):
+        tables.load_tables(str(path))
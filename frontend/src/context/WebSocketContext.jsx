@@ -4,6 +4,11 @@ import { WS_BASE_URL } from '../config';
 
 const WebSocketContext = createContext(null);
 
+const RECONNECT_BASE_MS = 1000;
+const RECONNECT_MAX_MS = 30000;
+// 1008 policy violation (auth, bad variant), 1013 try again later (connection rate limit)
+const NO_RETRY_CODES = [1008, 1013];
+
 export const WebSocketProvider = ({ children }) => {
     const { token } = useAuth();
     const [socket, setSocket] = useState(null);
@@ -13,17 +18,26 @@ export const WebSocketProvider = ({ children }) => {
     // We don't connect globally, but per room. 
     // However, for simplicity, we provide a connect function.
     const wsRef = useRef(null);
+    // Resume token and last seen event, so a dropped socket can pick up where it left off
+    const sessionRef = useRef({ resumeToken: null, lastSeq: 0, retries: 0 });
 
-
-
-    const connectToRoom = (roomId) => {
+    const connectToRoom = (roomId, resume = false) => {
         if (wsRef.current) {
-            wsRef.current.close();
+            const old = wsRef.current;
+            wsRef.current = null;
+            old.close();
         }
 
         if (!token) return;
 
-        const wsUrl = `${WS_BASE_URL}/ws/${roomId}?token=${token}`;
+        if (!resume) {
+            sessionRef.current = { resumeToken: null, lastSeq: 0, retries: 0 };
+        }
+        const { resumeToken, lastSeq } = sessionRef.current;
+        let wsUrl = `${WS_BASE_URL}/ws/${roomId}?token=${token}`;
+        if (resume && resumeToken) {
+            wsUrl += `&resume=${resumeToken}&last_seq=${lastSeq}`;
+        }
         const ws = new WebSocket(wsUrl);
 
         ws.onopen = () => {
@@ -33,12 +47,31 @@ export const WebSocketProvider = ({ children }) => {
 
         ws.onmessage = (event) => {
             const data = JSON.parse(event.data);
+            if (data.seq) {
+                sessionRef.current.lastSeq = data.seq;
+            }
+            if (data.type === 'session') {
+                sessionRef.current.resumeToken = data.resume_token;
+                sessionRef.current.retries = 0; // Seated again, so the next drop starts from the shortest wait
+            }
             setMessages((prev) => [...prev, data]);
         };
 
-        ws.onclose = () => {
-            console.log('Disconnected from room:', roomId);
+        ws.onclose = (event) => {
+            console.log('Disconnected from room:', roomId, event.code);
             setIsConnected(false);
+            if (wsRef.current !== ws) return; // Replaced or closed by us
+            // The server turned us away (bad token, unknown variant, connection limit): retrying won't help
+            if (NO_RETRY_CODES.includes(event.code)) {
+                wsRef.current = null;
+                return;
+            }
+            // Unexpected drop: try to resume the seat, backing off 1s, 2s, 4s... up to the cap
+            const delay = Math.min(RECONNECT_BASE_MS * 2 ** sessionRef.current.retries, RECONNECT_MAX_MS);
+            sessionRef.current.retries += 1;
+            setTimeout(() => {
+                if (wsRef.current === ws) connectToRoom(roomId, true);
+            }, delay);
         };
 
         wsRef.current = ws;
@@ -53,7 +86,9 @@ export const WebSocketProvider = ({ children }) => {
 
     const disconnect = () => {
         if (wsRef.current) {
-            wsRef.current.close();
+            const old = wsRef.current;
+            wsRef.current = null;
+            old.close();
             setSocket(null);
             setIsConnected(false);
         }
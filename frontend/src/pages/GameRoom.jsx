@@ -52,9 +52,11 @@ export default function GameRoom() {
                 setGameState(lastMsg.state);
             }
 
-            // Handle chat messages
-            if (lastMsg.type === 'chat_message') {
-                setChatMessages(prev => [...prev, lastMsg]);
+            // Handle chat messages (batched by the server)
+            if (lastMsg.type === 'chat_batch') {
+                setChatMessages(prev => [...prev, ...lastMsg.messages]);
+            } else if (lastMsg.type === 'chat_history') {
+                setChatMessages(lastMsg.messages);
             }
         }
     }, [messages]);